@@ -71,6 +71,7 @@ def update_license(session):
     session.log('dot-file license')
     _dot = list(Path().glob('./python_active_versions/**/*.json'))
     _dot.extend(list(Path().glob('./tests/**/*.json')))
+    _dot.extend(list(Path().glob('./tests/**/*.html')))
     _dot.extend(list(Path().glob('./docs/**/*.json')))
     _dot.extend(list(Path().glob('./**/*.rst')))
     _dot.extend(list(Path().glob('./**/*.md')))
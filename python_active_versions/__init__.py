@@ -4,16 +4,22 @@
 
 """Top-level package for python active versions."""
 import logging
+import os
 
 try:
-    from icecream import ic, install
+    # icecream import is slow, load it only when explicitly requested
+    if not os.environ.get('PYTHON_ACTIVE_VERSIONS_ICECREAM'):
+        raise ImportError('icecream not requested')
+    from icecream import ic
 
-    # installing icecream
-    install()
-    ic.configureOutput(outputFunction=logging.debug, includeContext=True)
+    # imported where needed, never installed as builtin
+    ic.configureOutput(outputFunction=logging.getLogger(__name__).debug, includeContext=True)
 except ImportError:  # Graceful fallback if IceCream isn't installed.
     ic = lambda *a: None if not a else (a[0] if len(a) == 1 else a)  # noqa  # pylint: disable=C3001
 
+# library logs go to the handlers of the application, if any, never configured here
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
 __author__ = "Gabriele Pongelli"
 __email__ = "gabriele.pongelli@gmail.com"
 __version__ = "1.19.0"
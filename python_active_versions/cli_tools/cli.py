@@ -4,18 +4,30 @@
 
 """Console script for python-active-versions."""
 
-import inspect
-import os
-import sys
-import types
-from typing import Any, Callable, TypeVar, cast
+import json
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple, TypeVar
 
 import click
+from click.core import ParameterSource
 from cloup import HelpFormatter, HelpTheme, Style, option, option_group
 
 from python_active_versions import __version__
-from python_active_versions.python_active_versions import get_active_python_versions
-from python_active_versions.utility import configure_logger
+from python_active_versions.cli_tools.output import CHANGE_RENDERERS, RENDERERS
+from python_active_versions.constants import (
+    DOCKER_HUB_MAX_PAGE_SIZE,
+    DOCKER_TAGS_EXPIRE,
+    HTTP_CACHE_BACKENDS,
+    HTTP_CACHE_PATH,
+    PAGE_FRESHNESS,
+    WORKERS,
+)
+from python_active_versions.metrics import StatsCollector, metrics
+from python_active_versions.parsers import PARSERS
+from python_active_versions.tag_filter import FILTER_KINDS, TagFilter
+from python_active_versions.utility import configure_logger, default_cache_dir
 
 F = TypeVar('F', bound=Callable[..., Any])
 
@@ -29,7 +41,88 @@ formatter_settings = HelpFormatter.settings(
 )
 
 
-@click.command(name="get_python_versions")
+def _stream_python_versions(  # pylint: disable=too-many-arguments,too-many-locals
+    loglevel: str,
+    docker: bool,
+    get_main: bool,
+    *,
+    page_size: int,
+    parser: str,
+    incremental: bool,
+    workers: int,
+    timeout: Optional[float],
+    docker_packages: Tuple[str, ...],
+    tag_filter: Optional[TagFilter],
+    http_cache: dict,
+    no_stdout: bool,
+) -> None:
+    """Print active python versions as NDJSON, one line per version as soon as it's ready.
+
+    Arguments:
+        loglevel: set log level.
+        docker: Include also info coming from docker's python active images.
+        get_main: Returns also "main" branch that has no explicit version numbering.
+        page_size: Docker Hub tags fetched per page.
+        parser: HTML parser extracting data from scraped pages.
+        incremental: Fetch only Docker tags newer than the already known ones.
+        workers: Python branches fetched at the same time.
+        timeout: Overall seconds before giving up branches not yet completed.
+        docker_packages: Docker packages to get images of.
+        tag_filter: Docker tags selection.
+        http_cache: HTTP cache backend, location and expiration.
+        no_stdout: Skip stdout print.
+
+    Raises:
+        ClickException: some page or python branch couldn't be fetched, raised after printing all the other ones.
+    """
+    configure_logger(loglevel)
+    from python_active_versions.python_active_versions import (  # pylint: disable=import-outside-toplevel
+        ActiveVersionsError,
+        iter_active_python_versions,
+    )
+
+    try:
+        for _v in iter_active_python_versions(
+            docker,
+            no_main=get_main,
+            page_size=page_size,
+            parser=parser,
+            incremental=incremental,
+            max_workers=workers,
+            timeout=timeout,
+            docker_packages=docker_packages,
+            tag_filter=tag_filter,
+            **http_cache,
+        ):
+            if not no_stdout:
+                click.echo(json.dumps(_v))
+    except (ValueError, OSError, ActiveVersionsError) as exc:
+        raise click.ClickException(str(exc)) from exc
+
+
+def _parse_tag_filter(_ctx: click.Context, _param: click.Parameter, value: Tuple[str, ...]) -> Optional[TagFilter]:
+    """Build the tag filter of given expressions.
+
+    Arguments:
+        _ctx: Click context
+        _param: tag filter option
+        value: filter expressions
+
+    Returns:
+        tag filter, None without expressions
+
+    Raises:
+        BadParameter: invalid expression
+    """
+    if not value:
+        return None
+    try:
+        return TagFilter.parse(value)
+    except ValueError as exc:
+        raise click.BadParameter(str(exc)) from exc
+
+
+@click.group(name="get_python_versions", invoke_without_command=True)
 @option_group(
     "Generic Options",
     option(
@@ -41,6 +134,70 @@ formatter_settings = HelpFormatter.settings(
         show_default=True,
         help="set log level",
     ),
+    option(
+        '-a',
+        '--async',
+        'use_async',
+        is_flag=True,
+        type=click.BOOL,
+        default=False,
+        show_default=True,
+        help="Fetch everything over a single asyncio event loop.",
+    ),
+    option(
+        '-c',
+        '--concurrency',
+        'concurrency',
+        type=click.IntRange(min=1),
+        default=WORKERS * WORKERS,
+        show_default=True,
+        help="Maximum requests in flight when using --async.",
+    ),
+    option(
+        '-P',
+        '--parser',
+        'parser',
+        type=click.Choice(list(PARSERS)),
+        default='lxml',
+        show_default=True,
+        help="HTML parser extracting data from scraped pages.",
+    ),
+    option(
+        '-w',
+        '--workers',
+        'workers',
+        type=click.IntRange(min=1),
+        default=WORKERS,
+        show_default=True,
+        help="Python branches fetched at the same time.",
+    ),
+    option(
+        '-T',
+        '--timeout',
+        'timeout',
+        type=click.FloatRange(min=0),
+        default=None,
+        help="Overall seconds before giving up branches not yet completed.",
+    ),
+    option(
+        '-s',
+        '--stream',
+        'stream',
+        is_flag=True,
+        type=click.BOOL,
+        default=False,
+        show_default=True,
+        help="Print each version as a JSON line as soon as it's ready, in completion order. Implies ndjson output.",
+    ),
+    option(
+        '--stats',
+        'stats',
+        is_flag=True,
+        type=click.BOOL,
+        default=False,
+        show_default=True,
+        help="Print HTTP calls and stage timings summary on stderr.",
+    ),
 )
 @option_group(
     "Docker",
@@ -54,9 +211,132 @@ formatter_settings = HelpFormatter.settings(
         show_default=True,
         help="Get Docker image info.",
     ),
+    option(
+        '-p',
+        '--page-size',
+        'page_size',
+        type=click.IntRange(1, DOCKER_HUB_MAX_PAGE_SIZE),
+        default=DOCKER_HUB_MAX_PAGE_SIZE,
+        show_default=True,
+        help="Docker Hub tags fetched per page.",
+    ),
+    option(
+        '-i',
+        '--incremental',
+        'incremental',
+        is_flag=True,
+        type=click.BOOL,
+        default=False,
+        show_default=True,
+        help="Fetch only Docker tags newer than the already known ones.",
+    ),
+    option(
+        '-k',
+        '--docker-package',
+        'docker_packages',
+        multiple=True,
+        type=str,
+        help="Docker package to get images of, as python, pypy or namespace/name. Can be repeated, implies --docker.",
+    ),
+    option(
+        '-f',
+        '--tag-filter',
+        'tag_filter',
+        multiple=True,
+        type=str,
+        callback=_parse_tag_filter,
+        help=f"Docker tags filter, one of {', '.join(FILTER_KINDS)} followed by :VALUE, as variant:slim or "
+        "arch:arm64. Can be repeated, all of them must match.",
+    ),
+)
+@option_group(
+    "HTTP Cache",
+    option(
+        '--http-cache-backend',
+        'http_cache_backend',
+        type=click.Choice(HTTP_CACHE_BACKENDS),
+        default=None,
+        envvar='PYTHON_ACTIVE_VERSIONS_HTTP_CACHE_BACKEND',
+        show_envvar=True,
+        help="HTTP cache backend  [default: sqlite]",
+    ),
+    option(
+        '--http-cache-path',
+        'http_cache_path',
+        type=str,
+        default=None,
+        envvar='PYTHON_ACTIVE_VERSIONS_HTTP_CACHE_PATH',
+        show_envvar=True,
+        help=f"HTTP cache sqlite file or filesystem folder, redis url for redis backend  [default: {HTTP_CACHE_PATH}]",
+    ),
+    option(
+        '--http-cache-expire',
+        'http_cache_expire',
+        type=click.IntRange(min=0),
+        default=None,
+        envvar='PYTHON_ACTIVE_VERSIONS_HTTP_CACHE_EXPIRE',
+        show_envvar=True,
+        help=f"Seconds docker tags are kept into HTTP cache  [default: {DOCKER_TAGS_EXPIRE}]",
+    ),
+)
+@option_group(
+    "Result Cache",
+    option(
+        '-t',
+        '--cache-ttl',
+        'cache_ttl',
+        type=click.IntRange(min=0),
+        default=None,
+        help="Seconds a cached result is served without fetching, a stale one is refreshed in background.",
+    ),
+    option(
+        '--refresh',
+        'refresh',
+        is_flag=True,
+        type=click.BOOL,
+        default=False,
+        show_default=True,
+        help="Fetch the result even if cached, then cache it.",
+    ),
+    option(
+        '--offline',
+        'offline',
+        is_flag=True,
+        type=click.BOOL,
+        default=False,
+        show_default=True,
+        help="Return the cached result without any request.",
+    ),
+    option(
+        '--snapshot',
+        'snapshot',
+        type=click.Path(exists=True, dir_okay=False),
+        default=None,
+        help="Read versions from a file written by export subcommand, without any request.",
+    ),
+    option(
+        '--single-flight',
+        'single_flight',
+        is_flag=True,
+        type=click.BOOL,
+        default=False,
+        show_default=True,
+        envvar='PYTHON_ACTIVE_VERSIONS_SINGLE_FLIGHT',
+        show_envvar=True,
+        help="Wait for another process of the host fetching the same result and read it, as parallel CI jobs.",
+    ),
 )
 @option_group(
     "Filtering Results",
+    option(
+        '-o',
+        '--output',
+        'output',
+        type=click.Choice(list(RENDERERS)),
+        default='text',
+        show_default=True,
+        help="Output format, machine-readable ones have no banner.",
+    ),
     option(
         '-m',
         '--main',
@@ -75,45 +355,365 @@ formatter_settings = HelpFormatter.settings(
         type=click.BOOL,
         default=False,
         show_default=True,
-        help="Redirect stdout to /dev/null.",
+        help="Skip stdout print.",
     ),
 )
 @click.version_option(__version__)
-def get_python_versions(loglevel: str, docker: bool, get_main: bool, no_stdout: bool):
+@click.pass_context
+def get_python_versions(  # pylint: disable=too-many-arguments,too-many-locals,too-many-branches
+    ctx: click.Context,
+    *,
+    loglevel: str,
+    use_async: bool,
+    concurrency: int,
+    parser: str,
+    workers: int,
+    timeout: Optional[float],
+    stream: bool,
+    stats: bool,
+    docker: bool,
+    page_size: int,
+    incremental: bool,
+    docker_packages: Tuple[str, ...],
+    tag_filter: Optional[TagFilter],
+    http_cache_backend: Optional[str],
+    http_cache_path: Optional[str],
+    http_cache_expire: Optional[int],
+    cache_ttl: Optional[int],
+    refresh: bool,
+    offline: bool,
+    snapshot: Optional[str],
+    single_flight: bool,
+    get_main: bool,
+    output: str,
+    no_stdout: bool,
+):
     """Cli script to show which are currently active python versions.
     \f
     Arguments:
+        ctx: Click context, given options are passed to subcommands through it.
         loglevel: set log level.
+        use_async: Use the asyncio fetch engine.
+        concurrency: Maximum requests in flight with the asyncio fetch engine.
+        parser: HTML parser extracting data from scraped pages.
+        workers: Python branches fetched at the same time.
+        timeout: Overall seconds before giving up branches not yet completed.
+        stream: Print versions as NDJSON lines as soon as they are ready.
+        stats: Print HTTP calls and stage timings summary on stderr.
         docker: Include also info coming from docker's python active images.
+        page_size: Docker Hub tags fetched per page.
+        incremental: Fetch only Docker tags newer than the already known ones.
+        docker_packages: Docker packages to get images of.
+        tag_filter: Docker tags selection.
+        http_cache_backend: HTTP cache backend.
+        http_cache_path: HTTP cache location.
+        http_cache_expire: Seconds docker tags are kept into HTTP cache.
+        cache_ttl: Seconds a cached result is fresh.
+        refresh: Fetch the result even if cached.
+        offline: Return the cached result without any request.
+        snapshot: Read versions from a snapshot file.
+        single_flight: Share the fetch with other processes asking the same.
         get_main: Returns also "main" branch that has no explicit version numbering.
+        output: Output format.
         no_stdout: Skip stdout print.
+
+    Raises:
+        UsageError: options not available with asyncio engine, or mutually exclusive ones given.
+        ClickException: offline mode without any cached result, or some page or python branch couldn't be fetched.
     """  # noqa: D205,D301
-    # https://stackoverflow.com/questions/6735917/redirecting-stdout-to-nothing-in-python
-    # redirecting stdout to dev null so no click.echo is displayed
-    if no_stdout:
-        _f = open(os.devnull, 'w', encoding='utf-8')  # pylint: disable=consider-using-with
-        sys.stdout = _f
+    if refresh and offline:
+        raise click.UsageError("--refresh and --offline are mutually exclusive.")
+    if incremental and docker_packages:
+        raise click.UsageError("--incremental and --docker-package are mutually exclusive.")
+    _result_cache = cache_ttl is not None or refresh or offline or single_flight
+    # asyncio engine bounds its requests in flight by --concurrency instead of workers
+    _threaded_only = _result_cache or ctx.get_parameter_source('workers') is not ParameterSource.DEFAULT
+    if use_async and (_threaded_only or incremental or docker_packages or tag_filter):
+        raise click.UsageError(
+            "Result cache, workers, incremental, docker package and tag filter options are not available with --async."
+        )
+    if (stream or use_async) and snapshot is not None:
+        raise click.UsageError("--snapshot is not available with --stream or --async.")
+    if stream and (use_async or _result_cache):
+        raise click.UsageError("Asyncio engine and result cache options are not available with --stream.")
+    if stream and output not in ('text', 'ndjson'):
+        raise click.UsageError("--stream always prints ndjson output.")
+    if ctx.invoked_subcommand is not None and (use_async or stream):
+        raise click.UsageError("--async and --stream are not available with subcommands.")
+    docker = docker or bool(docker_packages)
 
-    _fnc_name = cast(types.FrameType, inspect.currentframe()).f_code.co_name
-    _complete_doc = inspect.getdoc(eval(_fnc_name))  # pylint: disable=eval-used  # nosec B307  # noqa: S307
-    _doc = f"{_complete_doc}".split('\n')[0]  # use only doc first row
-    _str = f"{_doc[:-1]} - v{__version__}"
-    click.echo(f"{_str}")
-    click.echo("=" * len(_str))
+    _http_cache = {
+        'cache_backend': http_cache_backend,
+        'cache_path': http_cache_path,
+        'cache_expire': http_cache_expire,
+    }
+    if ctx.invoked_subcommand is not None:
+        configure_logger(loglevel)
+        ctx.obj = {
+            'docker_images': docker,
+            'no_main': get_main,
+            'page_size': page_size,
+            'parser': parser,
+            'result_ttl': cache_ttl,
+            'refresh': refresh,
+            'offline': offline,
+            'incremental': incremental,
+            'max_workers': workers,
+            'timeout': timeout,
+            'docker_packages': docker_packages,
+            'tag_filter': tag_filter,
+            'snapshot': snapshot,
+            'single_flight': single_flight,
+            **_http_cache,
+        }
+        return
+    if stats:
+        _collector = StatsCollector()
+        metrics.add_hook(_collector)
+
+        def _print_stats() -> None:
+            metrics.remove_hook(_collector)
+            click.echo(_collector.summary(), err=True)
+
+        # printed also when the lookup fails, to see where it spent its time
+        ctx.call_on_close(_print_stats)
+    if stream:
+        _stream_python_versions(
+            loglevel,
+            docker,
+            get_main,
+            page_size=page_size,
+            parser=parser,
+            incremental=incremental,
+            workers=workers,
+            timeout=timeout,
+            docker_packages=docker_packages,
+            tag_filter=tag_filter,
+            http_cache=_http_cache,
+            no_stdout=no_stdout,
+        )
+        return
 
     configure_logger(loglevel)
 
-    click.echo("\nPython version found:")
-    for _v in get_active_python_versions(docker, loglevel, get_main):
-        click.echo(f"  Version: {_v['version']}")
-        click.echo(f"  Latest Software Version: {_v['latest_sw']}")
-        if 'docker_images' in _v and _v['docker_images']:
-            click.echo('  Docker images:')
-            _spaced = [f"    {x}" for x in _v['docker_images'] if x.startswith(_v['version'])]
-            click.echo("\n".join(_spaced))
+    # imported only now, --help and --version must not pay for networking and parsing libraries
+    from python_active_versions.python_active_versions import (  # pylint: disable=import-outside-toplevel
+        ActiveVersionsError,
+        get_active_python_versions,
+        get_active_python_versions_async,
+    )
+
+    try:
+        if use_async:
+            import asyncio  # pylint: disable=import-outside-toplevel
+
+            try:
+                _versions = asyncio.run(
+                    get_active_python_versions_async(
+                        docker,
+                        no_main=get_main,
+                        page_size=page_size,
+                        concurrency=concurrency,
+                        parser=parser,
+                        cache_backend=http_cache_backend,
+                        cache_path=http_cache_path,
+                        cache_expire=http_cache_expire,
+                        timeout=timeout,
+                    )
+                )
+            except asyncio.TimeoutError as exc:
+                raise click.ClickException(f"Active python versions not collected in {timeout} seconds.") from exc
+        else:
+            _versions = get_active_python_versions(
+                docker,
+                no_main=get_main,
+                page_size=page_size,
+                parser=parser,
+                result_ttl=cache_ttl,
+                refresh=refresh,
+                offline=offline,
+                incremental=incremental,
+                max_workers=workers,
+                timeout=timeout,
+                docker_packages=docker_packages,
+                snapshot=snapshot,
+                tag_filter=tag_filter,
+                single_flight=single_flight,
+                cache_backend=http_cache_backend,
+                cache_path=http_cache_path,
+                cache_expire=http_cache_expire,
+            )
+    except (LookupError, ValueError, OSError, ActiveVersionsError) as exc:
+        raise click.ClickException(str(exc)) from exc
+
+    if no_stdout:
+        return
+    # whole output serialized at once and written with a single call
+    _doc = (click.get_current_context().command.help or '.').splitlines()[0]  # use only doc first row
+    _title = f"{_doc[:-1]} - v{__version__}"
+    click.echo(RENDERERS[output](_versions, _title), nl=False)
+
+
+@get_python_versions.command(name="serve")
+@option(
+    '--host',
+    'host',
+    type=str,
+    default='127.0.0.1',
+    show_default=True,
+    help="Address to listen on.",
+)
+@option(
+    '--port',
+    'port',
+    type=click.IntRange(0, 65535),
+    default=8000,
+    show_default=True,
+    help="TCP port to listen on.",
+)
+@option(
+    '--unix-socket',
+    'unix_socket',
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Unix socket path to listen on instead of TCP.",
+)
+@option(
+    '--refresh-interval',
+    'refresh_interval',
+    type=click.FloatRange(min=1),
+    default=PAGE_FRESHNESS,
+    show_default=True,
+    help="Seconds between background refreshes of the served result.",
+)
+@click.pass_obj
+def serve(fetch_options: dict, host: str, port: int, unix_socket: Optional[str], refresh_interval: float):
+    """Serve active python versions as JSON over local HTTP, kept warm in memory.
+
+    Paths are /versions, all active versions, and /versions/<branch>, a single one. Options given before the
+    subcommand select what is fetched.
+    \f
+    Arguments:
+        fetch_options: get_active_python_versions arguments built from main command options.
+        host: Address to listen on.
+        port: TCP port to listen on.
+        unix_socket: Unix socket path to listen on instead of TCP.
+        refresh_interval: Seconds between background refreshes.
+
+    Raises:
+        ClickException: first fetch failed, or the server couldn't listen on the given address.
+    """  # noqa: D205,D301
+    from python_active_versions.python_active_versions import (  # pylint: disable=import-outside-toplevel
+        ActiveVersionsError,
+        get_active_python_versions,
+    )
+    from python_active_versions.server import serve as serve_forever  # pylint: disable=import-outside-toplevel
+
+    try:
+        serve_forever(partial(get_active_python_versions, **fetch_options), host, port, unix_socket, refresh_interval)
+    except (LookupError, ValueError, OSError, ActiveVersionsError) as exc:
+        raise click.ClickException(str(exc)) from exc
+
+
+@get_python_versions.command(name="export")
+@click.argument('path', type=click.Path(dir_okay=False, writable=True))
+@click.pass_obj
+def export(fetch_options: dict, path: str):
+    """Export active python versions to a snapshot file, used later with --snapshot.
+
+    Snapshot is compact JSON, gzip compressed when PATH ends with .gz. Options given before the subcommand select
+    what is exported, add --docker to include docker images.
+    \f
+    Arguments:
+        fetch_options: get_active_python_versions arguments built from main command options.
+        path: Snapshot file to be written.
+
+    Raises:
+        ClickException: offline mode without any cached result, or some page or python branch couldn't be fetched.
+    """  # noqa: D205,D301
+    from python_active_versions.python_active_versions import (  # pylint: disable=import-outside-toplevel
+        ActiveVersionsError,
+        get_active_python_versions,
+    )
+    from python_active_versions.snapshot import export_snapshot  # pylint: disable=import-outside-toplevel
+
+    try:
+        export_snapshot(get_active_python_versions(**fetch_options), path)
+    except (LookupError, ValueError, OSError, ActiveVersionsError) as exc:
+        raise click.ClickException(str(exc)) from exc
+
+
+@get_python_versions.command(name="diff")
+@option(
+    '--since',
+    'since',
+    type=click.DateTime(),
+    default=None,
+    help="Compare with the result known at this local time instead of the latest recorded one.",
+)
+@option(
+    '--history-dir',
+    'history_dir',
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Folder of recorded results  [default: history into cache folder]",
+)
+@option(
+    '--no-record',
+    'no_record',
+    is_flag=True,
+    type=click.BOOL,
+    default=False,
+    show_default=True,
+    help="Don't record the current result into history.",
+)
+@option(
+    '--format',
+    'output_format',
+    type=click.Choice(list(CHANGE_RENDERERS)),
+    default='text',
+    show_default=True,
+    help="Changes output format.",
+)
+@click.pass_obj
+def diff(fetch_options: dict, since: Optional[Any], history_dir: Optional[str], no_record: bool, output_format: str):
+    """Show changes of active python versions since the last recorded result, then record the current one.
+
+    Changes are added or removed branches, new latest releases, end of life changes and added or removed docker
+    tags. Each combination of docker, main, docker package and tag filter options has its own history.
+    \f
+    Arguments:
+        fetch_options: get_active_python_versions arguments built from main command options.
+        since: Compare with the result known at this time.
+        history_dir: Folder of recorded results.
+        no_record: Don't record the current result.
+        output_format: Changes output format.
+
+    Raises:
+        ClickException: offline mode without any cached result, or some page or python branch couldn't be fetched.
+    """  # noqa: D205,D301
+    from python_active_versions.history import History  # pylint: disable=import-outside-toplevel
+    from python_active_versions.python_active_versions import (  # pylint: disable=import-outside-toplevel
+        ActiveVersionsError,
+        get_active_python_versions,
+    )
+    from python_active_versions.result_cache import cache_key  # pylint: disable=import-outside-toplevel
+
+    _query = cache_key(
+        **{_k: fetch_options[_k] for _k in ('docker_images', 'no_main', 'docker_packages', 'tag_filter')}
+    )
+    _history = History(Path(history_dir or default_cache_dir() / 'history') / _query[:16])
+    try:
+        _created = time.time()
+        _versions = get_active_python_versions(**fetch_options)
+    except (LookupError, ValueError, OSError, ActiveVersionsError) as exc:
+        raise click.ClickException(str(exc)) from exc
 
-        click.echo("-" * len(_str))
+    _changes = _history.diff(_versions, None if since is None else since.timestamp())
+    if not no_record:
+        _history.record(_versions, _created)
+    click.echo(CHANGE_RENDERERS[output_format](_changes), nl=False)
 
 
 if __name__ == "__main__":
-    get_python_versions()  # pragma: no cover  # pylint: disable=no-value-for-parameter
+    get_python_versions()  # pragma: no cover  # pylint: disable=no-value-for-parameter,missing-kwoa
@@ -0,0 +1,154 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Serialization of active python versions for the console script."""
+
+import csv
+import io
+import json
+from typing import Callable, Dict, List, Sequence
+
+from python_active_versions.history import Change
+
+
+def _images(version: dict) -> Dict[str, List[str]]:
+    """Return docker images of a version grouped by package.
+
+    Arguments:
+        version: information of an active python version
+
+    Returns:
+        images by docker package, empty if docker images weren't fetched
+    """
+    if 'docker_packages' in version:
+        return version['docker_packages']
+    if version.get('docker_images'):
+        return {'python': version['docker_images']}
+    return {}
+
+
+def to_text(versions: List[dict], title: str) -> str:
+    """Render versions as human readable text, headed by given title.
+
+    Arguments:
+        versions: information of active python versions
+        title: banner printed before the versions
+
+    Returns:
+        rendered text
+    """
+    _lines = [title, "=" * len(title), "", "Python version found:"]
+    for _v in versions:
+        _lines.append(f"  Version: {_v['version']}")
+        _lines.append(f"  Latest Software Version: {_v['latest_sw']}")
+        _images_by_package = _images(_v)
+        for _package, _images_list in _images_by_package.items():
+            _lines.append(f"  Docker images ({_package}):" if 'docker_packages' in _v else "  Docker images:")
+            _lines.extend(f"    {x}" for x in _images_list)
+        _lines.append("-" * len(title))
+    return "\n".join(_lines) + "\n"
+
+
+def to_json(versions: List[dict], _title: str = '') -> str:
+    """Render versions as a single JSON array.
+
+    Arguments:
+        versions: information of active python versions
+        _title: unused, machine-readable formats have no banner
+
+    Returns:
+        rendered JSON
+    """
+    return json.dumps(versions) + "\n"
+
+
+def to_ndjson(versions: List[dict], _title: str = '') -> str:
+    """Render versions as JSON lines, one per version.
+
+    Arguments:
+        versions: information of active python versions
+        _title: unused, machine-readable formats have no banner
+
+    Returns:
+        rendered JSON lines
+    """
+    return "".join(f"{json.dumps(_v)}\n" for _v in versions)
+
+
+def to_csv(versions: List[dict], _title: str = '') -> str:
+    """Render versions as CSV with a header row, docker images of every package space separated into their column.
+
+    Arguments:
+        versions: information of active python versions
+        _title: unused, machine-readable formats have no banner
+
+    Returns:
+        rendered CSV
+    """
+    _rows = []
+    for _v in versions:
+        _row = {_k: _v[_k] for _k in ('version', 'latest_sw', 'start', 'end')}
+        for _package, _images_list in _images(_v).items():
+            _column = 'docker_images' if 'docker_packages' not in _v else f"docker_images:{_package}"
+            _row[_column] = ' '.join(_images_list)
+        _rows.append(_row)
+    _fields = list(dict.fromkeys(_k for _row in _rows for _k in _row)) or ['version', 'latest_sw', 'start', 'end']
+    _buffer = io.StringIO()
+    _writer = csv.DictWriter(_buffer, fieldnames=_fields, lineterminator="\n")
+    _writer.writeheader()
+    _writer.writerows(_rows)
+    return _buffer.getvalue()
+
+
+RENDERERS: Dict[str, Callable[[List[dict], str], str]] = {
+    'text': to_text,
+    'json': to_json,
+    'ndjson': to_ndjson,
+    'csv': to_csv,
+}
+
+
+def changes_to_text(changes: Sequence[Change]) -> str:
+    """Render history changes as human readable lines.
+
+    Arguments:
+        changes: ``history.Change`` records
+
+    Returns:
+        rendered text, one line per change
+    """
+    if not changes:
+        return "No changes\n"
+    _lines = []
+    for _c in changes:
+        _package = f" ({_c.package})" if _c.package else ''
+        if _c.kind == 'added':
+            _lines.append(f"{_c.version}: added, latest release {_c.new}")
+        elif _c.kind == 'removed':
+            _lines.append(f"{_c.version}: removed, latest release was {_c.old}")
+        elif _c.kind == 'tag-added':
+            _lines.append(f"{_c.version}: docker tag added{_package} {_c.new}")
+        elif _c.kind == 'tag-removed':
+            _lines.append(f"{_c.version}: docker tag removed{_package} {_c.old}")
+        else:
+            _lines.append(f"{_c.version}: {_c.kind.replace('-', ' ')} {_c.old} -> {_c.new}")
+    return "\n".join(_lines) + "\n"
+
+
+def changes_to_ndjson(changes: Sequence[Change]) -> str:
+    """Render history changes as JSON lines, one per change.
+
+    Arguments:
+        changes: ``history.Change`` records
+
+    Returns:
+        rendered JSON lines
+    """
+    return "".join(f"{json.dumps(_c._asdict())}\n" for _c in changes)
+
+
+CHANGE_RENDERERS: Dict[str, Callable[[Sequence[Change]], str]] = {
+    'text': changes_to_text,
+    'ndjson': changes_to_ndjson,
+}
@@ -0,0 +1,17 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Constants shared by library and console script, kept free of heavy imports."""
+
+DOCKER_HUB_MAX_PAGE_SIZE = 100
+WORKERS = 4
+HOST_CONCURRENCY = WORKERS * WORKERS
+PAGE_FRESHNESS = 300  # five minutes
+DOCKER_TAGS_EXPIRE = 604800  # one week
+REQUEST_TIMEOUT = 120  # seconds a single request may take
+HTTP_CACHE_BACKENDS = ('sqlite', 'memory', 'filesystem', 'redis')
+HTTP_CACHE_PATH = 'http_cache'
+DEVGUIDE_URL = 'https://devguide.python.org/versions/'
+DOWNLOADS_URL = 'https://www.python.org/downloads/'
+DOCKER_HUB_URL = 'https://registry.hub.docker.com/v2/repositories'
@@ -0,0 +1,100 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Exclusive lock files shared by every process of the host."""
+import sys
+import time
+from pathlib import Path
+from typing import IO, Optional, Union
+
+if sys.platform == 'win32':  # pragma: no cover
+    import msvcrt  # pylint: disable=import-error
+else:
+    import fcntl
+
+# seconds between attempts to take a busy lock
+_POLL_INTERVAL = 0.05
+
+
+class LockTimeoutError(TimeoutError):
+    """Lock still held by another process after the allowed wait."""
+
+
+def _try_lock(file: IO) -> None:
+    if sys.platform == 'win32':  # pragma: no cover
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+    else:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def _unlock(file: IO) -> None:
+    if sys.platform == 'win32':  # pragma: no cover
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+class FileLock:
+    """Exclusive lock of a file, released by the operating system if its holder dies.
+
+    Every acquisition opens the file on its own, so the lock is exclusive also among threads of the same process.
+    """
+
+    def __init__(self, path: Union[str, Path], timeout: Optional[float] = None):
+        """Lock of given file, not yet taken.
+
+        Arguments:
+            path: lock file, created with its folder when missing
+            timeout: seconds to wait for the lock, None to wait forever
+        """
+        self.path = Path(path)
+        self.timeout = timeout
+        self._file: Optional[IO] = None
+
+    def acquire(self) -> None:
+        """Take the lock, waiting for the process holding it.
+
+        Raises:
+            LockTimeoutError: lock still held after ``timeout`` seconds
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        _file = open(self.path, 'a+b')  # pylint: disable=consider-using-with
+        _deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            try:
+                _try_lock(_file)
+                break
+            except OSError as exc:
+                if _deadline is not None and time.monotonic() >= _deadline:
+                    _file.close()
+                    raise LockTimeoutError(f"{self.path} still locked after {self.timeout} seconds") from exc
+                time.sleep(_POLL_INTERVAL)
+        self._file = _file
+
+    def release(self) -> None:
+        """Release the lock, if taken."""
+        if self._file is None:
+            return
+        _unlock(self._file)
+        self._file.close()
+        self._file = None
+
+    def __enter__(self) -> 'FileLock':
+        """Take the lock.
+
+        Returns:
+            this lock
+        """
+        self.acquire()
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        """Release the lock.
+
+        Arguments:
+            _exc_info: exception raised into the block, if any
+        """
+        self.release()
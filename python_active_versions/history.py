@@ -0,0 +1,156 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Local history of past results and changes between them."""
+import logging
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from python_active_versions.snapshot import export_snapshot, load_snapshot
+from python_active_versions.utility import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# snapshots kept by a history, older ones are removed
+HISTORY_SIZE = 100
+
+
+class Change(NamedTuple):
+    """A difference between two results."""
+
+    kind: str
+    version: str
+    old: Optional[str]
+    new: Optional[str]
+    package: Optional[str] = None
+
+
+def _tags(version: dict) -> Optional[Dict[str, List[str]]]:
+    """Return docker tags of a version by package.
+
+    Arguments:
+        version: information of an active python version
+
+    Returns:
+        tags by docker package, None if they weren't fetched
+    """
+    if 'docker_packages' in version:
+        return version['docker_packages']
+    if 'docker_images' in version:
+        return {'python': version['docker_images']}
+    return None
+
+
+def diff_versions(old: List[dict], new: List[dict]) -> List[Change]:
+    """Return the changes from a result to a newer one.
+
+    Change kinds are ``added`` and ``removed`` for branches, ``release`` when the latest release of a branch
+    changes, ``end-of-life`` when its end of life date changes, ``tag-added`` and ``tag-removed`` for docker tags;
+    tags are compared only when both results have them.
+
+    Arguments:
+        old: older active python versions
+        new: newer active python versions
+
+    Returns:
+        changes, in newer result order with removed branches last
+    """
+    _old = {_v['version']: _v for _v in old}
+    _new = {_v['version']: _v for _v in new}
+    _changes: List[Change] = []
+    for _branch, _version in _new.items():
+        _before = _old.get(_branch)
+        if _before is None:
+            _changes.append(Change('added', _branch, None, _version['latest_sw']))
+            continue
+        if _before['latest_sw'] != _version['latest_sw']:
+            _changes.append(Change('release', _branch, _before['latest_sw'], _version['latest_sw']))
+        if _before['end'] != _version['end']:
+            _changes.append(Change('end-of-life', _branch, _before['end'], _version['end']))
+        _old_tags, _new_tags = _tags(_before), _tags(_version)
+        if _old_tags is None or _new_tags is None:
+            continue
+        for _package, _package_tags in _new_tags.items():
+            _known = set(_old_tags.get(_package, []))
+            _changes.extend(
+                Change('tag-added', _branch, None, _t, _package) for _t in _package_tags if _t not in _known
+            )
+            _current = set(_package_tags)
+            _changes.extend(
+                Change('tag-removed', _branch, _t, None, _package)
+                for _t in _old_tags.get(_package, [])
+                if _t not in _current
+            )
+    _changes.extend(Change('removed', _b, _v['latest_sw'], None) for _b, _v in _old.items() if _b not in _new)
+    return _changes
+
+
+class History:
+    """Past results stored as gzip compressed snapshots, one file per result that differs from the previous one."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, size: int = HISTORY_SIZE):
+        """History stored into given folder.
+
+        Arguments:
+            path: folder of snapshot files, default to ``history`` folder into the user cache folder
+            size: snapshots kept, older ones are removed
+        """
+        self.path = Path(path) if path else default_cache_dir() / 'history'
+        self.size = size
+
+    def entries(self) -> List[float]:
+        """Return creation timestamps of stored results.
+
+        Returns:
+            timestamps, oldest first
+        """
+        return sorted(int(_f.name.split('.')[0]) / 1000 for _f in self.path.glob('*.json.gz'))
+
+    def _file(self, created: float) -> Path:
+        return self.path / f"{round(created * 1000)}.json.gz"
+
+    def load(self, since: Optional[float] = None) -> Optional[List[dict]]:
+        """Return the result known at given time.
+
+        Arguments:
+            since: timestamp, default to the latest stored result
+
+        Returns:
+            latest result stored at or before ``since``, the oldest one if all of them are newer, None if empty
+        """
+        _entries = self.entries()
+        if not _entries:
+            return None
+        _created = _entries[-1] if since is None else max([_e for _e in _entries if _e <= since] or _entries[:1])
+        return load_snapshot(self._file(_created))[1]
+
+    def record(self, versions: List[dict], created: float) -> bool:
+        """Store a result, unless it's the same of the latest stored one.
+
+        Arguments:
+            versions: active python versions, as returned by ``get_active_python_versions``
+            created: timestamp of the result
+
+        Returns:
+            True if the result has been stored
+        """
+        if self.load() == versions:
+            return False
+        export_snapshot(versions, self._file(created), created)
+        for _old in self.entries()[: -self.size]:
+            logger.info("Removing old history entry %s", _old)
+            self._file(_old).unlink()
+        return True
+
+    def diff(self, versions: List[dict], since: Optional[float] = None) -> List[Change]:
+        """Return the changes of a result since a stored one.
+
+        Arguments:
+            versions: active python versions, as returned by ``get_active_python_versions``
+            since: timestamp, default to the latest stored result
+
+        Returns:
+            changes from the result known at ``since``, every branch is ``added`` when the history is empty
+        """
+        return diff_versions(self.load(since) or [], versions)
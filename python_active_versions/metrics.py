@@ -0,0 +1,152 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Instrumentation of HTTP calls and scraping stages, delivered to registered hooks."""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class HttpEvent(NamedTuple):
+    """A completed HTTP call."""
+
+    url: str
+    status: int
+    from_cache: bool
+    bytes: int
+    latency: float
+    retries: int
+
+
+class StageEvent(NamedTuple):
+    """A completed scraping stage."""
+
+    stage: str
+    label: Optional[str]
+    seconds: float
+
+
+Event = Union[HttpEvent, StageEvent]
+Hook = Callable[[Event], None]
+
+
+class Metrics:
+    """Registry of hooks receiving every instrumentation event, nothing is measured while it's empty."""
+
+    def __init__(self):
+        """Registry without hooks."""
+        self._hooks: List[Hook] = []
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        """Return if any hook is registered.
+
+        Returns:
+            True when events are delivered
+        """
+        return bool(self._hooks)
+
+    def add_hook(self, hook: Hook) -> None:
+        """Register a hook, called from the thread that completed the event.
+
+        Arguments:
+            hook: callable receiving ``HttpEvent`` and ``StageEvent`` instances
+        """
+        with self._lock:
+            self._hooks = [*self._hooks, hook]
+
+    def remove_hook(self, hook: Hook) -> None:
+        """Unregister a hook.
+
+        Arguments:
+            hook: previously registered hook
+        """
+        with self._lock:
+            self._hooks = [_h for _h in self._hooks if _h != hook]
+
+    def emit(self, event: Event) -> None:
+        """Deliver an event to every registered hook, a failing hook is logged and never breaks the lookup.
+
+        Arguments:
+            event: completed HTTP call or stage
+        """
+        for _hook in self._hooks:
+            try:
+                _hook(event)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Metrics hook %r failed", _hook)
+
+    @contextmanager
+    def stage(self, name: str, label: Optional[str] = None) -> Iterator[None]:
+        """Time the enclosed block as a stage.
+
+        Arguments:
+            name: stage name, as ``parse`` or ``docker-tags``
+            label: optional detail, as the python branch of a worker
+
+        Yields:
+            nothing, the block is timed when it exits
+        """
+        if not self._hooks:
+            yield
+            return
+        _start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.emit(StageEvent(name, label, time.perf_counter() - _start))
+
+
+class StatsCollector:
+    """Hook aggregating events into a summary."""
+
+    def __init__(self):
+        """Collector without events."""
+        self.http: List[HttpEvent] = []
+        self.stages: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event) -> None:
+        """Collect an event.
+
+        Arguments:
+            event: completed HTTP call or stage
+        """
+        with self._lock:
+            if isinstance(event, HttpEvent):
+                self.http.append(event)
+            else:
+                self.stages.setdefault(event.stage, []).append(event.seconds)
+
+    def summary(self) -> str:
+        """Return a human readable summary of collected events.
+
+        Returns:
+            summary text, one line per aggregate
+        """
+        _hits = sum(1 for _e in self.http if _e.from_cache)
+        _lines = [
+            f"HTTP requests: {len(self.http)}, cache hits: {_hits}, misses: {len(self.http) - _hits}, "
+            f"retries: {sum(_e.retries for _e in self.http)}",
+            f"HTTP bytes: {sum(_e.bytes for _e in self.http)}, "
+            f"latency: {sum(_e.latency for _e in self.http) * 1000:.1f} ms",
+        ]
+        if self.http:
+            _slowest = max(self.http, key=lambda _e: _e.latency)
+            _lines.append(f"Slowest request: {_slowest.latency * 1000:.1f} ms {_slowest.url}")
+        for _stage, _seconds in self.stages.items():
+            _lines.append(
+                f"Stage {_stage}: {len(_seconds)} x, total {sum(_seconds) * 1000:.1f} ms, "
+                f"max {max(_seconds) * 1000:.1f} ms"
+            )
+        return "\n".join(_lines)
+
+
+# hooks of the whole process
+metrics = Metrics()
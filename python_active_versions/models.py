@@ -0,0 +1,162 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Compact typed record of an active python version."""
+import calendar
+import datetime
+import re
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+_KEYS = ('version', 'latest_sw', 'start', 'end', 'docker_images', 'docker_packages')
+_DATE = re.compile(r'(\d{4})-(\d{2})(?:-(\d{2}))?')
+
+
+def parse_date(text: str, end_of_month: bool = False) -> Optional[datetime.date]:
+    """Parse a devguide date, either ``YYYY-MM-DD`` or ``YYYY-MM``, ignoring any trailing note.
+
+    Arguments:
+        text: date as shown into devguide table, as ``2023-10-02`` or ``2028-10``
+        end_of_month: dates without day are the last day of their month instead of the first one
+
+    Returns:
+        parsed date, None if the text has no date
+    """
+    _match = _DATE.match(text.strip())
+    if not _match:
+        return None
+    _year, _month, _day = int(_match.group(1)), int(_match.group(2)), _match.group(3)
+    if _day is not None:
+        return datetime.date(_year, _month, int(_day))
+    return datetime.date(_year, _month, calendar.monthrange(_year, _month)[1] if end_of_month else 1)
+
+
+class VersionInfo(Mapping):  # pylint: disable=too-many-instance-attributes
+    """Active python version with parsed dates and immutable tag tuples.
+
+    Attributes are typed, while the read-only mapping view returns the same values of the plain dict
+    returned by ``get_active_python_versions``: table text for dates, new lists for tags. Being a mapping and not
+    a dict, ``json`` can't serialize it: use ``as_dict`` for that.
+    """
+
+    __slots__ = _KEYS + ('_start_text', '_end_text')
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        version: str,
+        latest_sw: str,
+        start: str,
+        end: str,
+        *,
+        docker_images: Optional[Tuple[str, ...]] = None,
+        docker_packages: Optional[Dict[str, Tuple[str, ...]]] = None,
+    ):
+        """Record of a version, dates parsed once.
+
+        Arguments:
+            version: ``major.minor`` branch
+            latest_sw: latest downloadable release of the branch
+            start: first release date, as shown into devguide table
+            end: end of life date, as shown into devguide table, a month means its last day
+            docker_images: docker tags, None if not fetched
+            docker_packages: docker tags by package, None if not fetched
+        """
+        self.version = version
+        self.latest_sw = latest_sw
+        self.start = parse_date(start)
+        self.end = parse_date(end, end_of_month=True)
+        self.docker_images = docker_images
+        self.docker_packages = docker_packages
+        self._start_text = start
+        self._end_text = end
+
+    @classmethod
+    def from_dict(cls, info: Mapping) -> 'VersionInfo':
+        """Build the record of a version dict returned by ``get_active_python_versions``.
+
+        Arguments:
+            info: version information
+
+        Returns:
+            typed record
+        """
+        _images = info.get('docker_images')
+        _packages = info.get('docker_packages')
+        return cls(
+            info['version'],
+            info['latest_sw'],
+            info['start'],
+            info['end'],
+            docker_images=None if _images is None else tuple(_images),
+            docker_packages=None if _packages is None else {_p: tuple(_t) for _p, _t in _packages.items()},
+        )
+
+    def as_dict(self) -> dict:
+        """Return the plain dict returned by ``get_active_python_versions``, JSON serializable.
+
+        Returns:
+            version information
+        """
+        return dict(self.items())
+
+    def is_end_of_life(self, day: Optional[datetime.date] = None) -> bool:
+        """Return if the version reached its end of life.
+
+        Arguments:
+            day: day to check, default to today
+
+        Returns:
+            True once end of life date is passed, False if it isn't or it's unknown
+        """
+        return self.end is not None and self.end < (day or datetime.date.today())
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the value of given dict key.
+
+        Arguments:
+            key: dict key
+
+        Returns:
+            value as in plain dict, tags into new lists
+
+        Raises:
+            KeyError: key not available, docker ones are available only when fetched
+        """
+        if key == 'start':
+            return self._start_text
+        if key == 'end':
+            return self._end_text
+        if key == 'docker_images' and self.docker_images is not None:
+            return list(self.docker_images)
+        if key == 'docker_packages' and self.docker_packages is not None:
+            return {_p: list(_t) for _p, _t in self.docker_packages.items()}
+        if key in ('version', 'latest_sw'):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over dict keys.
+
+        Returns:
+            keys iterator
+        """
+        return (_k for _k in _KEYS if _k in ('start', 'end') or getattr(self, _k) is not None)
+
+    def __len__(self) -> int:
+        """Return dict keys count.
+
+        Returns:
+            keys count
+        """
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        """Return record representation.
+
+        Returns:
+            representation with typed attributes
+        """
+        return (
+            f"VersionInfo(version={self.version!r}, latest_sw={self.latest_sw!r}, start={self.start}, end={self.end})"
+        )
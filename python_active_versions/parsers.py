@@ -0,0 +1,149 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""HTML parsers extracting data from devguide and python.org pages."""
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Type
+
+
+class HtmlParser(ABC):
+    """Extract only the needed data from scraped pages."""
+
+    @abstractmethod
+    def version_rows(self, page: bytes) -> List[List[str]]:
+        """Extract the rows of devguide's versions table.
+
+        Arguments:
+            page: devguide versions page content
+
+        Returns:
+            text of every cell, row by row
+        """
+
+    @abstractmethod
+    def downloadable_versions(self, page: bytes) -> List[str]:
+        """Extract the releases listed into python.org downloads page.
+
+        Arguments:
+            page: python.org downloads page content
+
+        Returns:
+            release numbers, as listed into the page
+        """
+
+
+class LxmlParser(HtmlParser):
+    """Parser evaluating precompiled XPath expressions over a plain lxml tree."""
+
+    _xpaths: Dict[str, Callable] = {}
+
+    def __init__(self):
+        """Compile XPath expressions once, at first parser creation, importing lxml only when needed."""
+        from lxml import etree  # pylint: disable=import-outside-toplevel
+
+        if not LxmlParser._xpaths:
+            LxmlParser._xpaths = {
+                'rows': etree.XPath('(//*[@id="status-of-python-versions"]//table)[1]//tr[td]'),
+                'cells': etree.XPath('td'),
+                'downloads': etree.XPath(
+                    '//*[contains(concat(" ", normalize-space(@class), " "), " download-list-widget ")]//li'
+                ),
+                'release': etree.XPath('(.//span//a)[1]'),
+            }
+
+    @staticmethod
+    def _text(element) -> str:
+        """Return element text with normalized whitespaces.
+
+        Arguments:
+            element: lxml element
+
+        Returns:
+            element text
+        """
+        return ' '.join(element.text_content().split())
+
+    def version_rows(self, page: bytes) -> List[List[str]]:
+        """Extract the rows of devguide's versions table.
+
+        Arguments:
+            page: devguide versions page content
+
+        Returns:
+            text of every cell, row by row
+        """
+        from lxml import html  # pylint: disable=import-outside-toplevel
+
+        _tree = html.fromstring(page)
+        return [[self._text(td) for td in self._xpaths['cells'](tr)] for tr in self._xpaths['rows'](_tree)]
+
+    def downloadable_versions(self, page: bytes) -> List[str]:
+        """Extract the releases listed into python.org downloads page.
+
+        Arguments:
+            page: python.org downloads page content
+
+        Returns:
+            release numbers, as listed into the page
+        """
+        from lxml import html  # pylint: disable=import-outside-toplevel
+
+        _tree = html.fromstring(page)
+        return [self._text(self._xpaths['release'](li)[0]).split(' ')[1] for li in self._xpaths['downloads'](_tree)]
+
+
+class RequestsHtmlParser(HtmlParser):
+    """Parser using requests-html CSS selectors."""
+
+    def version_rows(self, page: bytes) -> List[List[str]]:
+        """Extract the rows of devguide's versions table.
+
+        Arguments:
+            page: devguide versions page content
+
+        Returns:
+            text of every cell, row by row
+        """
+        from requests_html import HTML  # pylint: disable=import-outside-toplevel
+
+        version_table = HTML(html=page).find("#status-of-python-versions table", first=True)
+        return [[v.text for v in tr.find("td")] for tr in version_table.find("tbody tr")]
+
+    def downloadable_versions(self, page: bytes) -> List[str]:
+        """Extract the releases listed into python.org downloads page.
+
+        Arguments:
+            page: python.org downloads page content
+
+        Returns:
+            release numbers, as listed into the page
+        """
+        from requests_html import HTML  # pylint: disable=import-outside-toplevel
+
+        spec_table = HTML(html=page).find(".download-list-widget li")
+        return [li.find('span a', first=True).text.split(' ')[1] for li in spec_table]
+
+
+PARSERS: Dict[str, Type[HtmlParser]] = {
+    'lxml': LxmlParser,
+    'requests-html': RequestsHtmlParser,
+}
+
+
+def get_parser(name: str = 'lxml') -> HtmlParser:
+    """Return the parser registered with given name.
+
+    Arguments:
+        name: parser name, one of ``PARSERS`` keys
+
+    Returns:
+        parser instance
+
+    Raises:
+        ValueError: unknown parser name
+    """
+    try:
+        return PARSERS[name]()
+    except KeyError as exc:
+        raise ValueError(f"Unknown parser '{name}', choose one of {', '.join(PARSERS)}") from exc
@@ -3,99 +3,1267 @@
 # SPDX-License-Identifier: MIT
 
 """Main module."""
+import asyncio
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List
+import math
+import os
+import threading
+import time
+import warnings
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures import as_completed, wait
+from contextlib import nullcontext
+from functools import partial
+from pathlib import Path
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+    overload,
+)
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
-from requests_cache import CacheMixin
-from requests_html import HTMLResponse, HTMLSession
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
+from requests_cache import DO_NOT_CACHE, CacheMixin
 
-from python_active_versions.utility import configure_logger
+from python_active_versions.constants import (
+    DEVGUIDE_URL,
+    DOCKER_HUB_MAX_PAGE_SIZE,
+    DOCKER_HUB_URL,
+    DOCKER_TAGS_EXPIRE,
+    DOWNLOADS_URL,
+    HTTP_CACHE_BACKENDS,
+    HTTP_CACHE_PATH,
+    PAGE_FRESHNESS,
+    REQUEST_TIMEOUT,
+    WORKERS,
+)
+from python_active_versions.metrics import HttpEvent, metrics
+from python_active_versions.models import VersionInfo
+from python_active_versions.parsers import get_parser
+from python_active_versions.releases import ReleaseIndex
+from python_active_versions.result_cache import DEFAULT_RESULT_TTL, ResultCache, cache_key
+from python_active_versions.snapshot import load_snapshot, select_versions
+from python_active_versions.tag_filter import TagFilter, starts_with
+from python_active_versions.tag_store import KnownTags, TagStore
+from python_active_versions.transport import Transport
 
+logger = logging.getLogger(__name__)
 
-class CachedHTMLSession(CacheMixin, HTMLSession):  # pylint: disable=W0223
-    """Session with features from both CachedSession and HTMLSession."""
+# results of get_active_python_versions, shared by every call of the process
+result_cache = ResultCache()
+# docker tags already fetched, used by incremental sync
+tag_store = TagStore()
+# retries, rate limits and circuit breakers of every host, shared by every session of the process
+transport = Transport()
 
 
-def _fetch_tags(package: str, version: str) -> List:
+# where the cache layer of the running thread found its last response, set by the first response hook,
+# and retries done by the transport to get it
+_response_origin = threading.local()
+# overall deadline of the request sent by the running thread, retries of the transport included
+_request_deadline = threading.local()
+
+
+def _remember_origin(response: Response, **_kwargs) -> None:
+    _response_origin.from_cache = bool(getattr(response, 'from_cache', False))
+
+
+class _ResilientSession(Session):
+    """Session sending its requests through a ``Transport``, below the cache layer."""
+
+    def __init__(self, *args, **kwargs):
+        """Session using the process wide transport, retrying failures and respecting rate limits.
+
+        Arguments:
+            args: Session positional arguments
+            kwargs: Session keyword arguments
+        """
+        super().__init__(*args, **kwargs)
+        self.transport = transport
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        """Send a request not answered by the cache through the transport.
+
+        Arguments:
+            request: prepared request
+            kwargs: Session send arguments
+
+        Returns:
+            last response, error ones included
+        """
+        response, _response_origin.retries = self.transport.send(
+            urlsplit(request.url).netloc,
+            partial(super().send, request, **kwargs),
+            getattr(_request_deadline, 'value', None),
+        )
+        return response
+
+
+class CachedHTMLSession(CacheMixin, _ResilientSession):  # pylint: disable=W0223
+    """Cached session fetching HTML pages and docker tags, reporting its calls to ``metrics`` hooks.
+
+    Pages are parsed by ``parsers``, so requests-html is imported only when its parser is chosen.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Session seeing responses before other hooks, when cache origin is still known.
+
+        Arguments:
+            args: CachedSession positional arguments
+            kwargs: CachedSession keyword arguments
+        """
+        super().__init__(*args, **kwargs)
+        self.hooks['response'].insert(0, _remember_origin)
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        """Send a request, timing it when any metrics hook is registered.
+
+        Arguments:
+            request: prepared request
+            kwargs: CachedSession send arguments
+
+        Returns:
+            response
+        """
+        if not metrics.active:
+            return super().send(request, **kwargs)
+        _start = time.perf_counter()
+        _response_origin.from_cache = False
+        _response_origin.retries = 0
+        response = super().send(request, **kwargs)
+        metrics.emit(
+            HttpEvent(
+                request.url,
+                response.status_code,
+                _response_origin.from_cache,
+                len(response.content),
+                time.perf_counter() - _start,
+                _response_origin.retries,
+            )
+        )
+        return response
+
+
+def _http_cache(backend: Optional[str], path: Optional[str]):
+    """Return requests-cache backend, falling back to environment variables and then to defaults.
+
+    Arguments:
+        backend: backend name, one of ``HTTP_CACHE_BACKENDS``
+        path: sqlite file or filesystem folder, redis url for redis backend
+
+    Returns:
+        backend name or instance, and cache name
+
+    Raises:
+        ValueError: unknown backend
+    """
+    backend = backend or os.environ.get('PYTHON_ACTIVE_VERSIONS_HTTP_CACHE_BACKEND', 'sqlite')
+    path = path or os.environ.get('PYTHON_ACTIVE_VERSIONS_HTTP_CACHE_PATH')
+    if backend not in HTTP_CACHE_BACKENDS:
+        raise ValueError(f"Unknown cache backend '{backend}', choose one of {', '.join(HTTP_CACHE_BACKENDS)}")
+
+    if backend == 'redis':
+        # redis is an optional dependency, needed only by this backend
+        from redis import Redis  # pylint: disable=import-outside-toplevel,import-error
+        from requests_cache import RedisCache  # pylint: disable=import-outside-toplevel
+
+        return RedisCache(connection=Redis.from_url(path or 'redis://localhost:6379')), HTTP_CACHE_PATH
+    return backend, path or HTTP_CACHE_PATH
+
+
+def build_session(  # pylint: disable=too-many-arguments
+    pool_size: int = WORKERS * WORKERS,
+    page_freshness: int = PAGE_FRESHNESS,
+    cache_backend: Optional[str] = None,
+    cache_path: Optional[str] = None,
+    cache_expire: Optional[int] = None,
+    *,
+    transport: Optional[Transport] = None,  # pylint: disable=redefined-outer-name
+) -> CachedHTMLSession:
+    """Build the cached session shared by every request of a run.
+
+    Scraped pages are fresh only for ``page_freshness`` seconds, then they're revalidated with a conditional
+    request (``If-None-Match`` / ``If-Modified-Since``) that costs a small ``304`` response when unchanged.
+    Expiration ignores server ``Cache-Control`` headers so that EOL data is never older than that window.
+
+    Cache arguments not given are read from ``PYTHON_ACTIVE_VERSIONS_HTTP_CACHE_BACKEND``,
+    ``PYTHON_ACTIVE_VERSIONS_HTTP_CACHE_PATH`` and ``PYTHON_ACTIVE_VERSIONS_HTTP_CACHE_EXPIRE`` environment variables.
+
+    Arguments:
+        pool_size: keep-alive connections kept for each host, should match the number of threads using the session
+        page_freshness: seconds devguide and python.org pages are served from cache without revalidation
+        cache_backend: one of ``sqlite`` (default), ``memory``, ``filesystem`` or ``redis``
+        cache_path: sqlite file or filesystem folder (default ``http_cache`` into working directory), redis url
+        cache_expire: seconds docker tags are cached, default to one week
+        transport: retry and rate limit handling of requests not answered by the cache, default to process wide one
+
+    Returns:
+        cached session with connection pool sized for the given threads
+    """
+    _backend, _name = _http_cache(cache_backend, cache_path)
+    if cache_expire is None:
+        cache_expire = int(os.environ.get('PYTHON_ACTIVE_VERSIONS_HTTP_CACHE_EXPIRE', DOCKER_TAGS_EXPIRE))
+    session = CachedHTMLSession(
+        cache_name=_name,
+        backend=_backend,
+        cache_control=False,
+        expire_after=cache_expire,
+        urls_expire_after={
+            urlsplit(DEVGUIDE_URL).netloc: page_freshness,
+            urlsplit(DOWNLOADS_URL).netloc: page_freshness,
+        },
+    )
+    _adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', _adapter)
+    session.mount('http://', _adapter)
+    if transport is not None:
+        session.transport = transport
+    return session
+
+
+def _with_page(url: str, page: int) -> str:
+    """Return the given paginated url pointing to another page.
+
+    Arguments:
+        url: url returned by docker hub as ``next`` page
+        page: page number to point to
+
+    Returns:
+        same url with its ``page`` query parameter replaced
+    """
+    _parts = urlsplit(url)
+    _query = [(k, v) for k, v in parse_qsl(_parts.query) if k != 'page']
+    _query.append(('page', str(page)))
+    return urlunsplit(_parts._replace(query=urlencode(_query)))
+
+
+def _tags_url(package: str, version: str, page_size: int, ordering: Optional[str] = None) -> str:
+    """Return docker hub url of the first tags page.
+
+    Arguments:
+        package: package name to be fetched, official images as ``python`` or ``namespace/name`` ones
+        version: python's version to fetch docker images
+        page_size: tags per page requested to docker hub, capped to its maximum allowed value
+        ordering: docker hub sort order, ``last_updated`` lists most recent tags first
+
+    Returns:
+        url of the first page of tags
+    """
+    _page_size = max(1, min(page_size, DOCKER_HUB_MAX_PAGE_SIZE))
+    _repository = package if '/' in package else f"library/{package}"
+    _url = f"{DOCKER_HUB_URL}/{_repository}/tags?name={version}&page_size={_page_size}"
+    return f"{_url}&ordering={ordering}" if ordering else _url
+
+
+def _next_page_urls(first_page: dict) -> List[str]:
+    """Return urls of the pages still to be fetched when they are worth fetching concurrently.
+
+    Arguments:
+        first_page: json content of the first tags page
+
+    Returns:
+        urls derived from ``next`` one for every remaining page, empty if ``next`` can simply be followed
+    """
+    if not first_page['next'] or not first_page['results']:
+        return []
+
+    _pages = math.ceil(first_page['count'] / len(first_page['results']))
+    if _pages <= 2:
+        return []
+    return [_with_page(first_page['next'], _p) for _p in range(2, _pages + 1)]
+
+
+def _request_timeout(deadline: Optional[float]) -> float:
+    """Return the timeout of a request, so that it ends by the overall deadline.
+
+    Arguments:
+        deadline: ``time.monotonic`` time the whole lookup must end by, None if unbounded
+
+    Returns:
+        seconds the request may take
+
+    Raises:
+        TimeoutError: deadline already passed, the request must not be started
+    """
+    if deadline is None:
+        return REQUEST_TIMEOUT
+    _remaining = deadline - time.monotonic()
+    if _remaining <= 0:
+        raise TimeoutError("Overall timeout expired")
+    return min(REQUEST_TIMEOUT, _remaining)
+
+
+def _get(session: CachedHTMLSession, url: str, deadline: Optional[float], **kwargs) -> Response:
+    """Send a get request ending by the overall deadline, retries and rate limit waits included.
+
+    Arguments:
+        session: session used by every request
+        url: requested url
+        deadline: ``time.monotonic`` time the whole lookup must end by, None if unbounded
+        kwargs: other session get arguments
+
+    Returns:
+        response
+    """
+    _timeout = _request_timeout(deadline)
+    _request_deadline.value = deadline
+    try:
+        return session.get(url, timeout=_timeout, **kwargs)
+    finally:
+        _request_deadline.value = None
+
+
+def _get_page(session: CachedHTMLSession, url: str, deadline: Optional[float] = None, cache: bool = True) -> dict:
+    """Fetch a single docker hub page.
+
+    Arguments:
+        session: session used by every request
+        url: page url
+        deadline: ``time.monotonic`` time after which no request is started, requests in flight time out by then
+        cache: read and store the page through the http cache
+
+    Returns:
+        page json content
+    """
+    logger.info("Fetching docker tags: %s", url)
+    if cache:
+        _response = _get(session, url, deadline)
+    else:
+        _response = _get(session, url, deadline, expire_after=DO_NOT_CACHE)
+    _response.raise_for_status()
+    return _response.json()
+
+
+def _follow_pages(  # pylint: disable=too-many-arguments
+    session: CachedHTMLSession,
+    url: Optional[str],
+    single: bool = False,
+    keep: Optional[Callable[[dict], bool]] = None,
+    past: Optional[Callable[[str], bool]] = None,
+    *,
+    deadline: Optional[float] = None,
+    cache: bool = True,
+) -> List[dict]:
+    """Fetch a docker hub page and, unless ``single``, the following ones one after the other.
+
+    Arguments:
+        session: session used by every request
+        url: first page url
+        single: fetch only the given page
+        keep: tag results selection, applied to each page as soon as it's fetched
+        past: tells, from the last tag name of a page, that following pages can't hold any selected tag
+        deadline: ``time.monotonic`` time after which no request is started, requests in flight time out by then
+        cache: read and store pages through the http cache
+
+    Returns:
+        tag results of fetched pages
+    """
+    _results: List[dict] = []
+    while url:
+        _json = _get_page(session, url, deadline, cache)
+        _results.extend(_kept(_json['results'], keep))
+        _stop = single or not _json['results'] or (past is not None and past(_json['results'][-1]['name']))
+        url = None if _stop else _json['next']
+    return _results
+
+
+def _kept(results: List[dict], keep: Optional[Callable[[dict], bool]]) -> List[dict]:
+    """Return selected tag results of a page.
+
+    Arguments:
+        results: tag results of a page
+        keep: tag results selection, None to keep all of them
+
+    Returns:
+        selected tag results
+    """
+    return results if keep is None else [r for r in results if keep(r)]
+
+
+def _fetch_tag_results(  # pylint: disable=too-many-arguments,too-many-locals
+    package: str,
+    version: str,
+    page_size: int = DOCKER_HUB_MAX_PAGE_SIZE,
+    max_workers: int = WORKERS,
+    session: Optional[CachedHTMLSession] = None,
+    *,
+    ordering: Optional[str] = None,
+    tag_filter: Optional[TagFilter] = None,
+    deadline: Optional[float] = None,
+    cache: bool = True,
+) -> List[dict]:
+    """Fetch available docker tags, as returned by docker hub.
+
+    First page is fetched alone to read the total tags ``count``: when only one more page is left its
+    ``next`` url is simply followed, otherwise the remaining pages are derived from ``next`` url and
+    fetched concurrently, then merged back in page order.
+
+    A ``tag_filter`` is applied to each page as soon as it's fetched. When it has a prefix, the prefix is used as
+    docker hub name filter and tags are listed by name, one page after the other, until names sort after it.
+
+    Arguments:
+        package: package name to be fetched, default to python
+        version: python's version to fetch docker images
+        page_size: tags per page requested to docker hub, capped to its maximum allowed value
+        max_workers: maximum number of pages fetched at the same time
+        session: session to reuse, a new one is built if missing
+        ordering: docker hub sort order
+        tag_filter: tags selection, all tags listed by docker hub if missing
+        deadline: ``time.monotonic`` time after which no request is started, requests in flight time out by then
+        cache: read and store pages through the http cache
+
+    Returns:
+        list of docker hub tag results of package at that version
+    """
+    _name: Optional[str] = version
+    _keep = None
+    if tag_filter is not None:
+        _name = tag_filter.name_filter(version)
+        _keep = partial(tag_filter.matches, version)
+    if _name is None:
+        logger.info("No docker tags of %s %s can match %s", package, version, tag_filter)
+        return []
+    if session is None:
+        session = build_session(max_workers)
+    logger.info("Fetching docker tags for %s %s", package, version)
+
+    if tag_filter is not None and tag_filter.prefix is not None:
+        return _follow_pages(
+            session,
+            _tags_url(package, _name, page_size, 'name'),
+            keep=_keep,
+            past=partial(tag_filter.is_past, version),
+            deadline=deadline,
+            cache=cache,
+        )
+
+    _json = _get_page(session, _tags_url(package, _name, page_size, ordering), deadline, cache)
+    _results = _kept(_json['results'], _keep)
+
+    _urls = _next_page_urls(_json)
+    if _urls:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # map keeps submission order, so pages are merged as they were listed
+            for _page in executor.map(partial(_get_page, session, deadline=deadline, cache=cache), _urls):
+                _results.extend(_kept(_page['results'], _keep))
+        return _results
+
+    if _json['results']:
+        _results.extend(_follow_pages(session, _json['next'], keep=_keep, deadline=deadline, cache=cache))
+    return _results
+
+
+def _fetch_tags(  # pylint: disable=too-many-arguments
+    package: str,
+    version: str,
+    page_size: int = DOCKER_HUB_MAX_PAGE_SIZE,
+    max_workers: int = WORKERS,
+    session: Optional[CachedHTMLSession] = None,
+    *,
+    tag_filter: Optional[TagFilter] = None,
+    deadline: Optional[float] = None,
+) -> List:
     """Fetch available docker tags.
 
     Arguments:
         package: package name to be fetched, default to python
         version: python's version to fetch docker images
+        page_size: tags per page requested to docker hub, capped to its maximum allowed value
+        max_workers: maximum number of pages fetched at the same time
+        session: session to reuse, a new one is built if missing
+        tag_filter: tags selection, all tags listed by docker hub if missing
+        deadline: ``time.monotonic`` time after which no request is started, requests in flight time out by then
 
     Returns:
         list of docker imaged of package at that version
     """
-    _names = []
+    _results = _fetch_tag_results(
+        package, version, page_size, max_workers, session, tag_filter=tag_filter, deadline=deadline
+    )
+    return [r["name"] for r in _results]
+
+
+def _sync_tags(  # pylint: disable=too-many-arguments
+    package: str,
+    version: str,
+    page_size: int = DOCKER_HUB_MAX_PAGE_SIZE,
+    session: Optional[CachedHTMLSession] = None,
+    store: Optional[TagStore] = None,
+    *,
+    tag_filter: Optional[TagFilter] = None,
+    deadline: Optional[float] = None,
+) -> List:
+    """Fetch only docker tags newer than the already known ones.
+
+    Tags are listed most recent first, paging stops at the first tag not newer than the stored ``last_updated``
+    high-water mark, so in steady state a single request per version is done. The first sync fetches all pages.
+    Stored tags are not filtered, ``tag_filter`` selects the returned ones by name, architectures aren't stored.
 
-    _next_page = True
-    _page = 1
-    session = CachedHTMLSession(backend='sqlite', cache_control=True, expire_after=604800)  # one week
-    while _next_page:
-        logging.info("Fetching docker tags for %s %s , page %s", package, version, _page)
-        result = session.get(
-            f"https://registry.hub.docker.com/v2/repositories/library/{package}/tags?name={version}&page={_page}",
-            timeout=120,
+    Arguments:
+        package: package name to be fetched, default to python
+        version: python's version to fetch docker images
+        page_size: tags per page requested to docker hub, capped to its maximum allowed value
+        session: session to reuse, a new one is built if missing
+        store: known tags store, default to ``tag_store``
+        tag_filter: tags selection by name, all tags if missing
+        deadline: ``time.monotonic`` time after which no request is started, requests in flight time out by then
+
+    Returns:
+        list of docker imaged of package at that version, most recent first
+    """
+    if session is None:
+        session = build_session()
+    store = store or tag_store
+    _known = store.load(package, version)
+
+    # known tags come from the store, http cache would only hide the new ones
+    if _known is None or _known.last_updated is None:
+        _new = _fetch_tag_results(
+            package, version, page_size, session=session, ordering='last_updated', deadline=deadline, cache=False
         )
-        _json = result.json()
-        if not _json['next']:
-            _next_page = False
-        _page += 1
-        _names.extend([r["name"] for r in _json['results']])
+        _known = KnownTags([], None)
+    else:
+        _new = []
+        _url: Optional[str] = _tags_url(package, version, page_size, 'last_updated')
+        while _url:
+            logger.info("Syncing docker tags for %s %s : %s", package, version, _url)
+            _response = _get(session, _url, deadline, expire_after=DO_NOT_CACHE)
+            _response.raise_for_status()
+            _json = _response.json()
+            _fresh = [r for r in _json['results'] if r['last_updated'] and r['last_updated'] > _known.last_updated]
+            _new.extend(_fresh)
+            _url = _json['next'] if len(_fresh) == len(_json['results']) else None
+
+    _last_updated = max([r['last_updated'] for r in _new if r['last_updated']] + [_known.last_updated or ''])
+    _tags = list(dict.fromkeys([r['name'] for r in _new] + _known.tags))
+    store.save(package, version, KnownTags(_tags, _last_updated or None))
+    if tag_filter is not None:
+        return [_t for _t in _tags if tag_filter.match_name(version, _t)]
+    return _tags
+
+
+class ActiveVersionsError(Exception):
+    """Some python branches, or docker tags, couldn't be collected."""
+
+    def __init__(self, errors: Dict[str, BaseException], versions: List[dict]):
+        """Error of the failed branches.
+
+        Arguments:
+            errors: exception raised by each failed branch, or docker ``package:version`` lookup
+            versions: all versions, failed ones without their docker images
+        """
+        super().__init__("Failed to collect: " + ", ".join(f"{_b} ({_e!r})" for _b, _e in errors.items()))
+        self.errors = errors
+        self.versions = versions
+
+
+def _name_filters(versions: Iterable[str]) -> Dict[str, str]:
+    """Map each version to the shortest docker hub name filter covering it.
+
+    Docker hub ``name`` filter matches substrings, so tags of ``3.12.4`` are included into the ones of ``3.12``:
+    only filters not containing another one are fetched.
+
+    Arguments:
+        versions: versions to look up
+
+    Returns:
+        version to name filter to be fetched
+    """
+    _unique = sorted(set(versions), key=len)
+    _filters: List[str] = []
+    for _v in _unique:
+        if not any(_f in _v for _f in _filters):
+            _filters.append(_v)
+    return {_v: next(_f for _f in _filters if _f in _v) for _v in _unique}
+
+
+def fetch_docker_tags(  # pylint: disable=too-many-arguments,too-many-locals,too-many-branches
+    packages: Iterable[str],
+    versions: Iterable[str],
+    page_size: int = DOCKER_HUB_MAX_PAGE_SIZE,
+    max_workers: int = WORKERS * WORKERS,
+    session: Optional[CachedHTMLSession] = None,
+    *,
+    tag_filter: Optional[TagFilter] = None,
+    executor: Optional[Executor] = None,
+    deadline: Optional[float] = None,
+) -> Dict[str, Dict[str, List[str]]]:
+    """Fetch docker tags of many packages at many versions at once.
+
+    Overlapping name filters are fetched once, and every page of every package goes through the same bounded
+    pool: first pages are fetched together, then each one schedules its remaining pages as soon as it's known.
+    Only tags starting with their version, and selected by ``tag_filter``, are kept from each page.
+
+    Arguments:
+        packages: package names, official images as ``python`` or ``namespace/name`` ones
+        versions: versions used as tag name filter
+        page_size: tags per page requested to docker hub, capped to its maximum allowed value
+        max_workers: maximum number of pages fetched at the same time
+        session: session to reuse, a new one is built if missing
+        tag_filter: tags selection, see ``_fetch_tag_results``
+        executor: pool fetching the pages, kept running; a new one of ``max_workers`` threads if missing
+        deadline: ``time.monotonic`` time after which no request is started, requests in flight time out by then
+
+    Returns:
+        package to version to tags starting with the version, in docker hub order
+
+    Raises:
+        ActiveVersionsError: some ``package:version`` lookup failed
+    """
+    if session is None:
+        session = build_session(max_workers)
+    _filter = tag_filter or TagFilter()
+    _packages = list(dict.fromkeys(packages))
+    _names = {_v: _filter.name_filter(_v) for _v in versions}
+    _filters = _name_filters(_n for _n in _names.values() if _n is not None)
+    _versions: Dict[str, List[str]] = {}
+    for _v, _n in _names.items():
+        if _n is not None:
+            _versions.setdefault(_filters[_n], []).append(_v)
+    _crawls = [(_p, _f) for _p in _packages for _f in _versions]
+    # a prefix is a name filter only matching from the start of tags, listed by name they're over once past it
+    _ordering = None if _filter.prefix is None else 'name'
+
+    def _keep(name_filter: str, result: dict) -> bool:
+        return any(_filter.matches(_v, result) for _v in _versions[name_filter])
 
-    return _names
+    _results: Dict[Tuple[str, str], List[dict]] = {}
+    errors: Dict[str, BaseException] = {}
+    with nullcontext(executor) if executor else ThreadPoolExecutor(max_workers=max_workers) as _pool:
+        _firsts = {
+            _pool.submit(_get_page, session, _tags_url(_p, _f, page_size, _ordering), deadline): (_p, _f)
+            for _p, _f in _crawls
+        }
+        _rest: Dict[Tuple[str, str], List[Future]] = {}
+        for _future in as_completed(_firsts):
+            _crawl = _firsts[_future]
+            try:
+                _json = _future.result()
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                errors[':'.join(_crawl)] = exc
+                continue
+            _crawl_keep = partial(_keep, _crawl[1])
+            _results[_crawl] = _kept(_json['results'], _crawl_keep)
+            if _ordering is not None:
+                if _json['next'] and _json['results'] and not _filter.is_past(_crawl[1], _json['results'][-1]['name']):
+                    _past = partial(_filter.is_past, _crawl[1])
+                    _rest[_crawl] = [
+                        _pool.submit(
+                            _follow_pages, session, _json['next'], False, _crawl_keep, _past, deadline=deadline
+                        )
+                    ]
+                continue
+            _urls = _next_page_urls(_json)
+            if _urls:
+                _rest[_crawl] = [
+                    _pool.submit(_follow_pages, session, _u, True, _crawl_keep, deadline=deadline) for _u in _urls
+                ]
+            elif _json['next'] and _json['results']:
+                _rest[_crawl] = [
+                    _pool.submit(_follow_pages, session, _json['next'], False, _crawl_keep, deadline=deadline)
+                ]
 
+        for _crawl, _futures in _rest.items():
+            try:
+                for _future in _futures:
+                    _results[_crawl].extend(_future.result())
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                errors[':'.join(_crawl)] = exc
 
-def get_active_python_versions(
-    docker_images: bool = False, log_level: str = 'INFO', no_main: bool = True
-) -> List[dict]:  # pylint: disable=too-many-locals
+    if errors:
+        raise ActiveVersionsError(errors, [])
+
+    return {
+        _p: {
+            _v: [r['name'] for r in _results[(_p, _filters[_n])] if _filter.matches(_v, r)] if _n is not None else []
+            for _v, _n in _names.items()
+        }
+        for _p in _packages
+    }
+
+
+def _version_info(row: List[str], downloadable_versions: ReleaseIndex, no_main: bool) -> Optional[dict]:
+    """Match a devguide's branch with the latest downloadable release.
+
+    Arguments:
+        row: cells of devguide's versions table row
+        downloadable_versions: index of releases listed into python.org downloads page
+        no_main: Filter out "main" branch that has no explicit version numbering.
+
+    Returns:
+        version information, None if the branch is filtered out
+    """
+    branch, _, _, first_release, end_of_life, _ = row
+
+    if no_main is True and branch == 'main':
+        return None
+
+    logger.info("Found Python branch: %s", branch)
+    _latest_sw = downloadable_versions.latest(branch) or branch
+
+    return {"version": branch, "latest_sw": _latest_sw, "start": first_release, "end": end_of_life}
+
+
+@overload
+def get_active_python_versions(  # pylint: disable=too-many-arguments,too-many-locals
+    docker_images: bool = False,
+    log_level: Optional[str] = None,
+    no_main: bool = True,
+    *,
+    page_size: int = DOCKER_HUB_MAX_PAGE_SIZE,
+    parser: str = 'lxml',
+    result_ttl: Optional[int] = None,
+    refresh: bool = False,
+    offline: bool = False,
+    cache_backend: Optional[str] = None,
+    cache_path: Optional[str] = None,
+    cache_expire: Optional[int] = None,
+    incremental: bool = False,
+    max_workers: int = WORKERS,
+    timeout: Optional[float] = None,
+    docker_packages: Optional[Sequence[str]] = None,
+    snapshot: Optional[Union[str, Path]] = None,
+    typed: Literal[False] = False,
+    tag_filter: Optional[TagFilter] = None,
+    session: Optional[CachedHTMLSession] = None,
+    cache: Optional[ResultCache] = None,
+    executor: Optional[Executor] = None,
+    single_flight: bool = False,
+) -> List[dict]: ...
+
+
+@overload
+def get_active_python_versions(  # pylint: disable=too-many-arguments,too-many-locals
+    docker_images: bool = False,
+    log_level: Optional[str] = None,
+    no_main: bool = True,
+    *,
+    page_size: int = DOCKER_HUB_MAX_PAGE_SIZE,
+    parser: str = 'lxml',
+    result_ttl: Optional[int] = None,
+    refresh: bool = False,
+    offline: bool = False,
+    cache_backend: Optional[str] = None,
+    cache_path: Optional[str] = None,
+    cache_expire: Optional[int] = None,
+    incremental: bool = False,
+    max_workers: int = WORKERS,
+    timeout: Optional[float] = None,
+    docker_packages: Optional[Sequence[str]] = None,
+    snapshot: Optional[Union[str, Path]] = None,
+    typed: Literal[True],
+    tag_filter: Optional[TagFilter] = None,
+    session: Optional[CachedHTMLSession] = None,
+    cache: Optional[ResultCache] = None,
+    executor: Optional[Executor] = None,
+    single_flight: bool = False,
+) -> List[VersionInfo]: ...
+
+
+def get_active_python_versions(  # pylint: disable=too-many-arguments,too-many-locals
+    docker_images: bool = False,
+    log_level: Optional[str] = None,
+    no_main: bool = True,
+    *,
+    page_size: int = DOCKER_HUB_MAX_PAGE_SIZE,
+    parser: str = 'lxml',
+    result_ttl: Optional[int] = None,
+    refresh: bool = False,
+    offline: bool = False,
+    cache_backend: Optional[str] = None,
+    cache_path: Optional[str] = None,
+    cache_expire: Optional[int] = None,
+    incremental: bool = False,
+    max_workers: int = WORKERS,
+    timeout: Optional[float] = None,
+    docker_packages: Optional[Sequence[str]] = None,
+    snapshot: Optional[Union[str, Path]] = None,
+    typed: bool = False,
+    tag_filter: Optional[TagFilter] = None,
+    session: Optional[CachedHTMLSession] = None,
+    cache: Optional[ResultCache] = None,
+    executor: Optional[Executor] = None,
+    single_flight: bool = False,
+) -> Union[List[dict], List[VersionInfo]]:
     """Get active python versions.
 
+    Calls have no global side effects: logging is never configured, records go to ``python_active_versions``
+    loggers and reach the handlers of the application, if any.
+
+    Result cache is used when any of ``result_ttl``, ``refresh`` or ``offline`` is given: a fresh cached
+    result is returned without any request, a stale one is returned while it's refreshed in background.
+    Without them, ``single_flight`` coordinates concurrent calls of many processes: the first one fetches while holding
+    a lock, the others wait for it and read its result from the result cache.
+    A ``snapshot`` file takes precedence over both network and caches.
+    Branches that failed or didn't complete in time raise ``ActiveVersionsError``, holding the collected versions.
+
     Arguments:
         docker_images: flag to return also available docker images
-        log_level: string indicating log level on stdout
+        log_level: deprecated and ignored, logging is configured by the application
         no_main: Filter out "main" branch that has no explicit version numbering.
+        page_size: docker hub tags per page, at most 100.
+        parser: name of the HTML parser extracting data from scraped pages.
+        result_ttl: seconds a cached result is fresh, default to one hour when cache is used.
+        refresh: fetch the result even if cached, then cache it.
+        offline: return the cached result, whatever its age, without any request.
+        cache_backend: HTTP cache backend, one of ``sqlite``, ``memory``, ``filesystem`` or ``redis``.
+        cache_path: HTTP cache sqlite file or filesystem folder, redis url for redis backend.
+        cache_expire: seconds docker tags are kept into HTTP cache.
+        incremental: fetch only docker tags newer than the ones already known, most recent first; raises
+            ``ValueError`` with ``docker_packages``, only python tags are stored.
+        max_workers: branches fetched at the same time, each one fetching as many docker pages at the same time.
+        timeout: overall seconds before giving up branches not yet completed, every request times out by then.
+        docker_packages: docker packages whose tags are fetched, as ``python``, ``pypy`` or ``namespace/name``.
+            ``docker_images`` holds tags of the first one, ``docker_packages`` maps every package to its tags.
+        snapshot: file written by ``snapshot.export_snapshot`` to read versions from, without any request.
+        typed: return ``VersionInfo`` records, with parsed dates and tag tuples, instead of plain dicts.
+        tag_filter: docker tags selection, applied while tags are fetched; tags always start with their version.
+            An architecture raises ``ValueError`` with ``incremental`` or ``snapshot``, they have no tag images.
+        session: session used by every request, as built by ``build_session``; HTTP cache arguments are then ignored.
+        cache: result cache, default to the process wide ``result_cache``.
+        executor: runs branch workers and docker tags pipeline, kept running; a new one per call if missing.
+        single_flight: share the fetch with other processes asking the same at the same time, through result cache
+            files; a plain fetch is done when they can't be written.
 
     Returns:
-        dict containing all information of active python versions.
+        dict containing all information of active python versions, in devguide table order.
+    """
+    if log_level is not None:
+        warnings.warn(
+            "log_level is deprecated and ignored, configure logging into the application", DeprecationWarning, 2
+        )
+    cache = cache or result_cache
+
+    def _fetch() -> List[dict]:
+        # each branch worker can fetch its docker pages with as many threads
+        _session = session or build_session(
+            max_workers * max_workers, cache_backend=cache_backend, cache_path=cache_path, cache_expire=cache_expire
+        )
+        return _collect_active_python_versions(
+            _session,
+            docker_images,
+            no_main,
+            page_size=page_size,
+            parser=parser,
+            incremental=incremental,
+            max_workers=max_workers,
+            timeout=timeout,
+            docker_packages=docker_packages,
+            tag_filter=tag_filter,
+            executor=executor,
+        )
+
+    _key = cache_key(
+        docker_images=docker_images,
+        no_main=no_main,
+        page_size=page_size,
+        parser=parser,
+        incremental=incremental,
+        docker_packages=list(docker_packages or []),
+        tag_filter=tag_filter,
+    )
+    if snapshot is not None:
+        _versions = select_versions(load_snapshot(snapshot)[1], docker_images, no_main, tag_filter)
+    elif result_ttl is None and not refresh and not offline:
+        # processes asking the same wait for the one already fetching and read its result
+        _versions = cache.fetch_once(_key, _fetch, time.time()) if single_flight else _fetch()
+    else:
+        _versions = cache.get(
+            _key, _fetch, DEFAULT_RESULT_TTL if result_ttl is None else result_ttl, refresh=refresh, offline=offline
+        )
+    if typed:
+        return [VersionInfo.from_dict(_v) for _v in _versions]
+    return _versions
+
+
+def _iter_collected(  # pylint: disable=too-many-arguments,too-many-locals,too-many-branches
+    session: CachedHTMLSession,
+    docker_images: bool,
+    no_main: bool,
+    *,
+    page_size: int,
+    parser: str,
+    incremental: bool,
+    max_workers: int = WORKERS,
+    timeout: Optional[float] = None,
+    docker_packages: Optional[Sequence[str]] = None,
+    tag_filter: Optional[TagFilter] = None,
+    executor: Optional[Executor] = None,
+) -> Iterator[Tuple[int, dict]]:
+    """Scrape active python versions, yielding each one as soon as it's complete.
+
+    Docker tags of every branch are fetched concurrently (fan-out), each branch is yielded as soon as its worker
+    finishes. When ``docker_packages`` are given, their tags are fetched by ``fetch_docker_tags`` through a single
+    pipeline instead, and branches are yielded at its end.
+
+    Arguments:
+        session: session used by every request
+        docker_images: flag to return also available docker images
+        no_main: Filter out "main" branch that has no explicit version numbering.
+        page_size: docker hub tags per page, at most 100.
+        parser: name of the HTML parser extracting data from scraped pages.
+        incremental: fetch only docker tags newer than the ones already known.
+        max_workers: branches fetched at the same time, each one fetching as many docker pages at the same time.
+        timeout: overall seconds before giving up branches not yet completed, every request times out by then.
+        docker_packages: docker packages whose tags are fetched, default to python only.
+        tag_filter: docker tags selection, tags starting with their version if missing.
+        executor: runs branch workers and docker tags pipeline, not shut down; a new one of ``max_workers`` threads
+            if missing.
+
+    Yields:
+        position into devguide table and information of each active python version.
+
+    Raises:
+        ActiveVersionsError: some branch failed or didn't complete in time, raised after all other branches
+        ValueError: ``tag_filter`` architecture or ``docker_packages`` given with ``incremental``
     """
-    configure_logger(log_level)
-    versions = []
-    version_table_selector = "#status-of-python-versions table"
+    tag_filter = tag_filter or TagFilter()
+    if incremental and tag_filter.arch is not None:
+        raise ValueError("Architecture tag filter can't be used with incremental sync, known tags have no images")
+    if incremental and docker_packages:
+        raise ValueError("Docker packages can't be used with incremental sync, only python tags are stored")
+    _deadline = None if timeout is None else time.monotonic() + timeout
+    _parser = get_parser(parser)
 
-    session = CachedHTMLSession(backend='sqlite', cache_control=True, expire_after=604800)  # one week
-    _versions: HTMLResponse = session.get("https://devguide.python.org/versions/")
-    version_table = _versions.html.find(version_table_selector, first=True)
+    with metrics.stage('pages'):
+        _versions = _get(session, DEVGUIDE_URL, _deadline)
+        _versions.raise_for_status()
+        _downloads = _get(session, DOWNLOADS_URL, _deadline)
+        _downloads.raise_for_status()
+    with metrics.stage('parse'):
+        _rows = _parser.version_rows(_versions.content)
+        _releases = _parser.downloadable_versions(_downloads.content)
 
     # match development information with the latest downloadable release
-    _py_specific_release = ".download-list-widget li"
-    _downloads: HTMLResponse = session.get("https://www.python.org/downloads/")
-    spec_table = _downloads.html.find(_py_specific_release)
-    _downloadable_versions = [li.find('span a', first=True).text.split(' ')[1] for li in spec_table]
+    with metrics.stage('match'):
+        _downloadable = ReleaseIndex(_releases)
+        versions = [_d for _d in (_version_info(row, _downloadable, no_main) for row in _rows) if _d is not None]
+
+    if docker_images and docker_packages:
+        with metrics.stage('docker-tags'):
+            _tags = fetch_docker_tags(
+                docker_packages,
+                [_d['latest_sw'] for _d in versions],
+                page_size,
+                max_workers * max_workers,
+                session,
+                tag_filter=tag_filter,
+                executor=executor,
+                deadline=_deadline,
+            )
+        for _d in versions:
+            _d['docker_images'] = _tags[docker_packages[0]][_d['latest_sw']]
+            _d['docker_packages'] = {_p: _t[_d['latest_sw']] for _p, _t in _tags.items()}
+    if not docker_images or docker_packages:
+        yield from enumerate(versions)
+        return
+
+    def worker(version: dict) -> List:
+        with metrics.stage('docker-tags', version['version']):
+            if incremental:
+                return _sync_tags(
+                    'python',
+                    version['latest_sw'],
+                    page_size,
+                    session=session,
+                    tag_filter=tag_filter,
+                    deadline=_deadline,
+                )
+            return _fetch_tags(
+                'python',
+                version['latest_sw'],
+                page_size,
+                max_workers,
+                session,
+                tag_filter=tag_filter,
+                deadline=_deadline,
+            )
+
+    _executor = executor or ThreadPoolExecutor(max_workers=max_workers)
+    futures = {_executor.submit(worker, _d): _i for _i, _d in enumerate(versions)}
+    pending = set(futures)
+    errors: Dict[int, BaseException] = {}
+    try:
+        while pending:
+            _remaining = None if _deadline is None else max(0.0, _deadline - time.monotonic())
+            done, pending = wait(pending, _remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in sorted(done, key=futures.__getitem__):
+                _i = futures[future]
+                if future.exception() is not None:
+                    errors[_i] = cast(BaseException, future.exception())
+                    continue
+                versions[_i]['docker_images'] = future.result()
+                yield _i, versions[_i]
+    finally:
+        for future in pending:
+            future.cancel()
+        # don't wait for branches still running after the timeout, or when the caller stops iterating
+        if executor is None:
+            _executor.shutdown(wait=False)
+
+    for future in pending:
+        _branch = versions[futures[future]]['version']
+        errors[futures[future]] = FuturesTimeoutError(f"Branch {_branch} not completed in {timeout} seconds")
+    if errors:
+        raise ActiveVersionsError({versions[_i]['version']: errors[_i] for _i in sorted(errors)}, versions)
+
+
+def _collect_active_python_versions(*args, **kwargs) -> List[dict]:
+    """Scrape active python versions, see ``_iter_collected`` for arguments.
+
+    Arguments:
+        args: positional arguments of ``_iter_collected``
+        kwargs: keyword arguments of ``_iter_collected``
+
+    Returns:
+        dict containing all information of active python versions, in devguide table order.
+    """
+    return [_d for _, _d in sorted(_iter_collected(*args, **kwargs), key=lambda _item: _item[0])]
+
+
+@overload
+def iter_active_python_versions(  # pylint: disable=too-many-arguments
+    docker_images: bool = False,
+    no_main: bool = True,
+    *,
+    page_size: int = DOCKER_HUB_MAX_PAGE_SIZE,
+    parser: str = 'lxml',
+    incremental: bool = False,
+    max_workers: int = WORKERS,
+    timeout: Optional[float] = None,
+    docker_packages: Optional[Sequence[str]] = None,
+    cache_backend: Optional[str] = None,
+    cache_path: Optional[str] = None,
+    cache_expire: Optional[int] = None,
+    typed: Literal[False] = False,
+    tag_filter: Optional[TagFilter] = None,
+    session: Optional[CachedHTMLSession] = None,
+    executor: Optional[Executor] = None,
+) -> Iterator[dict]: ...
+
+
+@overload
+def iter_active_python_versions(  # pylint: disable=too-many-arguments
+    docker_images: bool = False,
+    no_main: bool = True,
+    *,
+    page_size: int = DOCKER_HUB_MAX_PAGE_SIZE,
+    parser: str = 'lxml',
+    incremental: bool = False,
+    max_workers: int = WORKERS,
+    timeout: Optional[float] = None,
+    docker_packages: Optional[Sequence[str]] = None,
+    cache_backend: Optional[str] = None,
+    cache_path: Optional[str] = None,
+    cache_expire: Optional[int] = None,
+    typed: Literal[True],
+    tag_filter: Optional[TagFilter] = None,
+    session: Optional[CachedHTMLSession] = None,
+    executor: Optional[Executor] = None,
+) -> Iterator[VersionInfo]: ...
 
-    def worker(ver, no_main_branch):
-        branch, _, _, first_release, end_of_life, _ = [v.text for v in ver.find("td")]
 
-        if no_main_branch is True and branch == 'main':
-            return
+def iter_active_python_versions(  # pylint: disable=too-many-arguments,too-many-locals
+    docker_images: bool = False,
+    no_main: bool = True,
+    *,
+    page_size: int = DOCKER_HUB_MAX_PAGE_SIZE,
+    parser: str = 'lxml',
+    incremental: bool = False,
+    max_workers: int = WORKERS,
+    timeout: Optional[float] = None,
+    docker_packages: Optional[Sequence[str]] = None,
+    cache_backend: Optional[str] = None,
+    cache_path: Optional[str] = None,
+    cache_expire: Optional[int] = None,
+    typed: bool = False,
+    tag_filter: Optional[TagFilter] = None,
+    session: Optional[CachedHTMLSession] = None,
+    executor: Optional[Executor] = None,
+) -> Iterator[Union[dict, VersionInfo]]:
+    """Iterate over active python versions, yielding each one as soon as its docker tags are fetched.
 
-        logging.info("Found Python branch: %s", branch)
-        _matching_version = list(
-            filter(lambda d: d.startswith(branch), _downloadable_versions)  # pylint: disable=cell-var-from-loop
+    Versions are yielded in completion order, not in devguide table order; failed branches raise
+    ``ActiveVersionsError`` once all the other ones are yielded.
+
+    Arguments:
+        docker_images: flag to return also available docker images
+        no_main: Filter out "main" branch that has no explicit version numbering.
+        page_size: docker hub tags per page, at most 100.
+        parser: name of the HTML parser extracting data from scraped pages.
+        incremental: fetch only docker tags newer than the ones already known, most recent first; raises
+            ``ValueError`` with ``docker_packages``, only python tags are stored.
+        max_workers: branches fetched at the same time, each one fetching as many docker pages at the same time.
+        timeout: overall seconds before giving up branches not yet completed, every request times out by then.
+        docker_packages: docker packages whose tags are fetched, as ``python``, ``pypy`` or ``namespace/name``.
+        cache_backend: HTTP cache backend, one of ``sqlite``, ``memory``, ``filesystem`` or ``redis``.
+        cache_path: HTTP cache sqlite file or filesystem folder, redis url for redis backend.
+        cache_expire: seconds docker tags are kept into HTTP cache.
+        typed: yield ``VersionInfo`` records, with parsed dates and tag tuples, instead of plain dicts.
+        tag_filter: docker tags selection, applied while tags are fetched; tags always start with their version.
+        session: session used by every request, as built by ``build_session``; HTTP cache arguments are then ignored.
+        executor: runs branch workers and docker tags pipeline, kept running; a new one per call if missing.
+
+    Yields:
+        information of each active python version.
+    """
+    if session is None:
+        session = build_session(
+            max_workers * max_workers, cache_backend=cache_backend, cache_path=cache_path, cache_expire=cache_expire
         )
-        _latest_sw = branch
-        if _matching_version:
-            _latest_sw = _matching_version[0]
+    for _, _d in _iter_collected(
+        session,
+        docker_images,
+        no_main,
+        page_size=page_size,
+        parser=parser,
+        incremental=incremental,
+        max_workers=max_workers,
+        timeout=timeout,
+        docker_packages=docker_packages,
+        tag_filter=tag_filter,
+        executor=executor,
+    ):
+        yield VersionInfo.from_dict(_d) if typed else _d
 
-        _d = {"version": branch, "latest_sw": _latest_sw, "start": first_release, "end": end_of_life}
-        if docker_images:
-            _d['docker_images'] = _fetch_tags('python', _latest_sw)
 
-        versions.append(_d)
+async def _fetch_tags_async(
+    package: str, version: str, page_size: int, get: Callable[[str], Awaitable[Response]]
+) -> List:
+    """Fetch available docker tags from an event loop.
+
+    Arguments:
+        package: package name to be fetched
+        version: python's version to fetch docker images
+        page_size: tags per page requested to docker hub, capped to its maximum allowed value
+        get: coroutine function performing the bounded get call
+
+    Returns:
+        list of docker imaged of package at that version, starting with the version
+    """
+    logger.info("Fetching docker tags for %s %s", package, version)
+
+    def _names(results: List[dict]) -> List[str]:
+        # docker hub name filter matches substrings, keep tags starting with the version
+        return [r["name"] for r in results if starts_with(r["name"], version)]
+
+    _json = (await get(_tags_url(package, version, page_size))).json()
+    _tags = _names(_json['results'])
+
+    _urls = _next_page_urls(_json)
+    if _urls:
+        # gather keeps the order of its awaitables, so pages are merged as they were listed
+        for _page in await asyncio.gather(*[get(_u) for _u in _urls]):
+            _tags.extend(_names(_page.json()['results']))
+        return _tags
+
+    while _json['next'] and _json['results']:
+        _json = (await get(_json['next'])).json()
+        _tags.extend(_names(_json['results']))
+    return _tags
+
+
+async def get_active_python_versions_async(  # pylint: disable=too-many-arguments,too-many-locals
+    docker_images: bool = False,
+    no_main: bool = True,
+    *,
+    page_size: int = DOCKER_HUB_MAX_PAGE_SIZE,
+    concurrency: int = WORKERS * WORKERS,
+    parser: str = 'lxml',
+    cache_backend: Optional[str] = None,
+    cache_path: Optional[str] = None,
+    cache_expire: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> List[dict]:
+    """Get active python versions without blocking the running event loop.
+
+    Every request of the run, devguide and python.org pages and all docker tags pages, is scheduled on the
+    running event loop and at most ``concurrency`` of them are in flight at the same time.
+
+    Arguments:
+        docker_images: flag to return also available docker images
+        no_main: Filter out "main" branch that has no explicit version numbering.
+        page_size: docker hub tags per page, at most 100.
+        concurrency: maximum number of requests in flight at the same time.
+        parser: name of the HTML parser extracting data from scraped pages.
+        cache_backend: HTTP cache backend, one of ``sqlite``, ``memory``, ``filesystem`` or ``redis``.
+        cache_path: HTTP cache sqlite file or filesystem folder, redis url for redis backend.
+        cache_expire: seconds docker tags are kept into HTTP cache.
+        timeout: overall seconds before giving up with ``asyncio.TimeoutError``, every request times out by then.
+
+    Returns:
+        dict containing all information of active python versions.
+
+    Raises:
+        ActiveVersionsError: docker tags of some branch couldn't be fetched
+    """
+    _parser = get_parser(parser)
+    _deadline = None if timeout is None else time.monotonic() + timeout
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    # not a context manager: leaving it waits for blocking calls in flight, stalling the loop on cancellation
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    async def _collect() -> Tuple[List[dict], Dict[str, BaseException]]:
+        # opening the HTTP cache touches the disk, keep it out of the event loop
+        session = await loop.run_in_executor(
+            executor,
+            partial(
+                build_session,
+                concurrency,
+                cache_backend=cache_backend,
+                cache_path=cache_path,
+                cache_expire=cache_expire,
+            ),
+        )
+
+        async def _bounded_get(url: str) -> Response:
+            async with semaphore:
+                # requests in flight end by the deadline too, so their threads don't outlive the call
+                _response = await loop.run_in_executor(executor, partial(_get, session, url, _deadline))
+            _response.raise_for_status()
+            return _response
+
+        _versions, _downloads = await asyncio.gather(_bounded_get(DEVGUIDE_URL), _bounded_get(DOWNLOADS_URL))
+        # parsing is CPU bound, keep it out of the event loop too
+        _rows = await loop.run_in_executor(executor, _parser.version_rows, _versions.content)
+        _downloadable = ReleaseIndex(
+            await loop.run_in_executor(executor, _parser.downloadable_versions, _downloads.content)
+        )
+        versions = [_d for _d in (_version_info(_row, _downloadable, no_main) for _row in _rows) if _d is not None]
+
+        errors: Dict[str, BaseException] = {}
+        if docker_images:
+            _tags = await asyncio.gather(
+                *[_fetch_tags_async('python', _d['latest_sw'], page_size, _bounded_get) for _d in versions],
+                return_exceptions=True,
+            )
+            for _d, _t in zip(versions, _tags):
+                if isinstance(_t, BaseException):
+                    errors[_d['version']] = _t
+                else:
+                    _d['docker_images'] = _t
+        return versions, errors
 
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        futures = [executor.submit(worker, tr, no_main) for tr in version_table.find("tbody tr")]
-        as_completed(futures, 10)
+    try:
+        versions, errors = await asyncio.wait_for(_collect(), timeout)
+    finally:
+        executor.shutdown(wait=False)
 
+    if errors:
+        raise ActiveVersionsError(errors, versions)
     return versions
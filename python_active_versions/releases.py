@@ -0,0 +1,68 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Index of downloadable python releases by branch."""
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_RELEASE = re.compile(r'^(\d+)\.(\d+)(?:\.(\d+))?(?:(a|b|rc)(\d+))?$')
+_PRE_RELEASE_RANK = {'a': 0, 'b': 1, 'rc': 2, None: 3}
+
+
+def release_key(release: str) -> Optional[Tuple[int, int, int, int, int]]:
+    """Return a key sorting releases by version, final release after its pre-releases.
+
+    Arguments:
+        release: release number, as ``3.12.4`` or ``3.13.0rc1``
+
+    Returns:
+        comparable key, None if the release number is not recognized
+    """
+    _match = _RELEASE.match(release)
+    if not _match:
+        return None
+    _major, _minor, _micro, _pre, _pre_number = _match.groups()
+    return int(_major), int(_minor), int(_micro or 0), _PRE_RELEASE_RANK[_pre], int(_pre_number or 0)
+
+
+class ReleaseIndex:
+    """Releases grouped by their ``major.minor`` branch, newest first."""
+
+    def __init__(self, releases: Iterable[str]):
+        """Index given releases, parsing them only once.
+
+        Arguments:
+            releases: release numbers, in any order
+        """
+        _keyed: Dict[str, List[Tuple[Tuple[int, int, int, int, int], str]]] = {}
+        for _release in releases:
+            _key = release_key(_release)
+            if _key is not None:
+                _keyed.setdefault(f"{_key[0]}.{_key[1]}", []).append((_key, _release))
+        self._branches: Dict[str, List[str]] = {
+            _branch: [_r for _, _r in sorted(_items, reverse=True)] for _branch, _items in _keyed.items()
+        }
+
+    def releases(self, branch: str) -> List[str]:
+        """Return all releases of a branch.
+
+        Arguments:
+            branch: ``major.minor`` branch
+
+        Returns:
+            releases, newest first
+        """
+        return self._branches.get(branch, [])
+
+    def latest(self, branch: str) -> Optional[str]:
+        """Return the latest release of a branch.
+
+        Arguments:
+            branch: ``major.minor`` branch
+
+        Returns:
+            latest release, None if the branch has no release
+        """
+        _releases = self._branches.get(branch)
+        return _releases[0] if _releases else None
@@ -0,0 +1,199 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Persistent cache of final results, served while a background refresh runs."""
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from python_active_versions.file_lock import FileLock, LockTimeoutError
+from python_active_versions.utility import default_cache_dir, write_atomically
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESULT_TTL = 3600  # one hour
+# seconds waited for another process fetching the same result, then it's fetched anyway
+LOCK_TIMEOUT = 300
+
+
+def cache_key(**arguments) -> str:
+    """Return the cache key of a call done with given arguments.
+
+    Arguments:
+        arguments: keyword arguments identifying the result
+
+    Returns:
+        hex digest of the arguments
+    """
+    return hashlib.sha256(json.dumps(arguments, sort_keys=True).encode()).hexdigest()
+
+
+class ResultCache:
+    """Results stored as json files, one per key, with an in-memory copy for the running process.
+
+    Callers always get their own copy of a result, changing it doesn't change the cached one.
+
+    A fresh result is returned as is, a stale one is returned immediately while a background thread
+    fetches the new one and stores it for the next calls.
+
+    Fetches are single-flight across processes sharing the folder: a lock file per key is held while fetching,
+    processes waiting for it read the result stored by its holder instead of fetching it again.
+    """
+
+    def __init__(self, path: Optional[Path] = None, lock_timeout: float = LOCK_TIMEOUT):
+        """Cache stored into given folder.
+
+        Arguments:
+            path: folder of result files, default to ``results`` folder into the user cache folder
+            lock_timeout: seconds waited for another process fetching the same result
+        """
+        self.path = Path(path) if path else default_cache_dir() / 'results'
+        self.lock_timeout = lock_timeout
+        self._memory: Dict[str, Tuple[float, List[dict]]] = {}
+        self._refreshing: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def _file(self, key: str) -> Path:
+        return self.path / f"{key}.json"
+
+    def load(self, key: str) -> Optional[Tuple[float, List[dict]]]:
+        """Return cached result of given key.
+
+        Arguments:
+            key: result key
+
+        Returns:
+            creation timestamp and a copy of the result, None if missing
+        """
+        if key not in self._memory:
+            _stored = self._read(key)
+            if _stored is None:
+                return None
+            self._memory[key] = _stored
+        _created, _versions = self._memory[key]
+        return _created, copy.deepcopy(_versions)
+
+    def _read(self, key: str) -> Optional[Tuple[float, List[dict]]]:
+        try:
+            _content = json.loads(self._file(key).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        return _content['created'], _content['versions']
+
+    def store(self, key: str, versions: List[dict]) -> None:
+        """Store result of given key, replacing the file atomically.
+
+        Arguments:
+            key: result key
+            versions: result to be stored
+        """
+        _created = time.time()
+        self._memory[key] = (_created, copy.deepcopy(versions))
+        write_atomically(self._file(key), json.dumps({'created': _created, 'versions': versions}).encode('utf-8'))
+
+    def fetch_once(self, key: str, fetch: Callable[[], List[dict]], fresh_after: float) -> List[dict]:
+        """Fetch and store the result of given key, unless another process stores it meanwhile.
+
+        The lock of the key is held while fetching: when it's busy, this call waits for its holder and returns
+        the result it stored, if created after ``fresh_after``. When the folder can't be written, the result is
+        fetched anyway and kept only in memory.
+
+        Arguments:
+            key: result key
+            fetch: callable returning the up-to-date result
+            fresh_after: timestamp after which a stored result is as good as a fetched one
+
+        Returns:
+            the result
+        """
+        _lock = FileLock(self.path / f"{key}.lock", self.lock_timeout)
+        try:
+            _lock.acquire()
+        except LockTimeoutError:
+            logger.warning("Result still being fetched by another process, fetching it anyway")
+            return self._fetch_and_store(key, fetch)
+        except OSError as exc:
+            logger.warning("Result cache not writable, fetching without lock: %s", exc)
+            return self._fetch_and_store(key, fetch)
+
+        try:
+            _stored = self._read(key)
+            if _stored is not None and _stored[0] >= fresh_after:
+                logger.info("Result fetched by another process, reading it")
+                self._memory[key] = _stored
+                return copy.deepcopy(_stored[1])
+            return self._fetch_and_store(key, fetch)
+        finally:
+            _lock.release()
+
+    def _fetch_and_store(self, key: str, fetch: Callable[[], List[dict]]) -> List[dict]:
+        _versions = fetch()
+        try:
+            self.store(key, _versions)
+        except OSError as exc:
+            logger.warning("Result not stored into result cache: %s", exc)
+        return _versions
+
+    def _refresh(self, key: str, fetch: Callable[[], List[dict]], ttl: int) -> None:
+        try:
+            self.fetch_once(key, fetch, time.time() - ttl)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("Background refresh of cached result failed")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _refresh_in_background(self, key: str, fetch: Callable[[], List[dict]], ttl: int) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        # not a daemon thread: a short-lived process waits the refresh before exiting, so it is stored
+        threading.Thread(target=self._refresh, args=(key, fetch, ttl), name=f"refresh-{key[:8]}").start()
+
+    def get(
+        self,
+        key: str,
+        fetch: Callable[[], List[dict]],
+        ttl: int = DEFAULT_RESULT_TTL,
+        refresh: bool = False,
+        offline: bool = False,
+    ) -> List[dict]:
+        """Return the result of given key, fetching it only when needed.
+
+        Arguments:
+            key: result key
+            fetch: callable returning the up-to-date result
+            ttl: seconds a stored result is fresh, a stale one is returned and refreshed in background
+            refresh: always fetch the result and store it
+            offline: never fetch, return the stored result whatever its age
+
+        Returns:
+            the result
+
+        Raises:
+            LookupError: offline mode without any stored result
+        """
+        if refresh and not offline:
+            return self.fetch_once(key, fetch, time.time())
+
+        _cached = self.load(key)
+        if offline:
+            if _cached is None:
+                raise LookupError("No cached result available in offline mode")
+            return _cached[1]
+
+        if _cached is None:
+            return self.fetch_once(key, fetch, time.time() - ttl)
+
+        _created, _versions = _cached
+        if time.time() - _created >= ttl:
+            logger.info("Cached result is stale, refreshing it in background")
+            self._refresh_in_background(key, fetch, ttl)
+        return _versions
@@ -0,0 +1,226 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Local HTTP API serving a warm, periodically refreshed copy of active python versions."""
+import hashlib
+import json
+import logging
+import os
+import socketserver
+import stat
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from python_active_versions.constants import PAGE_FRESHNESS
+
+logger = logging.getLogger(__name__)
+
+
+class WarmResult:
+    """Latest result kept in memory, already serialized as JSON for every served path."""
+
+    def __init__(self, fetch: Callable[[], List[dict]]):
+        """Result not yet fetched.
+
+        Arguments:
+            fetch: callable returning the up-to-date active python versions
+        """
+        self._fetch = fetch
+        self._bodies: Dict[str, Tuple[bytes, str]] = {}
+        self.updated: Optional[float] = None
+
+    @staticmethod
+    def _entry(content) -> Tuple[bytes, str]:
+        _body = json.dumps(content).encode()
+        return _body, f'"{hashlib.sha256(_body).hexdigest()[:32]}"'
+
+    def refresh(self) -> None:
+        """Fetch the result and replace the served one at once, requests never see a partial update."""
+        _versions = self._fetch()
+        _bodies = {'/versions': self._entry(_versions)}
+        _bodies.update({f"/versions/{_v['version']}": self._entry(_v) for _v in _versions})
+        self._bodies = _bodies
+        self.updated = time.time()
+
+    def get(self, path: str) -> Optional[Tuple[bytes, str]]:
+        """Return the serialized content of given path.
+
+        Arguments:
+            path: requested path, as ``/versions`` or ``/versions/3.12``
+
+        Returns:
+            JSON body and its entity tag, None for unknown paths or before the first refresh
+        """
+        return self._bodies.get(path.rstrip('/') or '/versions')
+
+    def refresh_periodically(self, interval: float, stop: threading.Event) -> threading.Thread:
+        """Refresh the result in a background thread, keeping the last one when a refresh fails.
+
+        Arguments:
+            interval: seconds between refreshes
+            stop: event ending the refresh loop
+
+        Returns:
+            started daemon thread
+        """
+
+        def _loop() -> None:
+            while not stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception:  # pylint: disable=broad-exception-caught
+                    logger.exception("Refresh of served result failed, keeping the previous one")
+
+        _thread = threading.Thread(target=_loop, name='serve-refresh', daemon=True)
+        _thread.start()
+        return _thread
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answer GET requests from the warm result, never fetching anything."""
+
+    server: Union['_HttpServer', '_UnixHttpServer']
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:  # noqa: N802  # pylint: disable=invalid-name
+        """Send the serialized result of requested path, or its 304 when the client copy is still valid."""
+        _entry = self.server.result.get(self.path.split('?')[0])
+        if _entry is None:
+            _status = 404 if self.server.result.updated else 503
+            self.send_response(_status)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        _body, _etag = _entry
+        if self.headers.get('If-None-Match') == _etag:
+            self.send_response(304)
+            self.send_header('ETag', _etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(_body)))
+        self.send_header('ETag', _etag)
+        self.end_headers()
+        self.wfile.write(_body)
+
+    def address_string(self) -> str:
+        """Return client address, unix socket clients have none.
+
+        Returns:
+            client host or socket path
+        """
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, format: str, *args) -> None:  # pylint: disable=redefined-builtin
+        """Log requests at debug level instead of writing them to stderr.
+
+        Arguments:
+            format: message format
+            args: message arguments
+        """
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class _HttpServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], result: WarmResult):
+        self.result = result
+        super().__init__(address, _Handler)
+
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+
+    class _UnixHttpServer(socketserver.ThreadingUnixStreamServer):  # pylint: disable=no-member
+        daemon_threads = True
+
+        def __init__(self, path: str, result: WarmResult):
+            self.result = result
+            super().__init__(path, _Handler)
+
+
+def _is_socket(path: str) -> bool:
+    """Return if a path is a unix socket, without following symbolic links.
+
+    Arguments:
+        path: file path
+
+    Returns:
+        True if the path exists and is a socket
+    """
+    try:
+        return stat.S_ISSOCK(os.lstat(path).st_mode)
+    except FileNotFoundError:
+        return False
+
+
+def create_server(
+    result: WarmResult, host: str = '127.0.0.1', port: int = 8000, unix_socket: Optional[str] = None
+) -> socketserver.BaseServer:
+    """Create the server answering from given result, bound but not yet serving.
+
+    Arguments:
+        result: warm result to be served
+        host: address to listen on
+        port: TCP port to listen on, 0 to pick a free one
+        unix_socket: path of a unix socket to listen on instead of TCP
+
+    Returns:
+        server, call ``serve_forever`` to answer requests
+
+    Raises:
+        ValueError: unix socket requested on a platform without them, or its path is taken by another kind of file
+    """
+    if unix_socket is None:
+        return _HttpServer((host, port), result)
+    if not hasattr(socketserver, 'ThreadingUnixStreamServer'):
+        raise ValueError("Unix sockets are not available on this platform")
+    if os.path.lexists(unix_socket):
+        if not _is_socket(unix_socket):
+            raise ValueError(f"{unix_socket} exists and is not a unix socket")
+        # left by a server that didn't shut down cleanly
+        os.unlink(unix_socket)
+    # defined together with ThreadingUnixStreamServer, checked above
+    return _UnixHttpServer(unix_socket, result)  # pylint: disable=possibly-used-before-assignment
+
+
+def serve(
+    fetch: Callable[[], List[dict]],
+    host: str = '127.0.0.1',
+    port: int = 8000,
+    unix_socket: Optional[str] = None,
+    refresh_interval: float = PAGE_FRESHNESS,
+) -> None:
+    """Fetch active python versions once, then serve them while refreshing in background, until interrupted.
+
+    Served paths are ``/versions``, all active versions, and ``/versions/<branch>``, a single one.
+
+    Arguments:
+        fetch: callable returning the up-to-date active python versions
+        host: address to listen on
+        port: TCP port to listen on
+        unix_socket: path of a unix socket to listen on instead of TCP
+        refresh_interval: seconds between background refreshes
+    """
+    _result = WarmResult(fetch)
+    _result.refresh()
+    _stop = threading.Event()
+    _result.refresh_periodically(refresh_interval, _stop)
+    with create_server(_result, host, port, unix_socket) as _server:
+        _address = _server.server_address
+        # unix socket servers are bound to a path, TCP ones to a host and port
+        _url = f"http://{host}:{_address[1]}" if isinstance(_address, tuple) else unix_socket
+        logger.info("Serving active python versions on %s", _url)
+        try:
+            _server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            _stop.set()
+            if unix_socket is not None and _is_socket(unix_socket):
+                os.unlink(unix_socket)
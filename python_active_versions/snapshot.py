@@ -0,0 +1,111 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Versioned snapshot files of active python versions, used without any network."""
+import gzip
+import json
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from python_active_versions.tag_filter import TagFilter
+from python_active_versions.utility import write_atomically
+
+SNAPSHOT_FORMAT = 1
+
+
+def export_snapshot(versions: List[dict], path: Union[str, Path], created: Optional[float] = None) -> None:
+    """Write active python versions into a compact snapshot file, gzip compressed when its name ends with ``.gz``.
+
+    Arguments:
+        versions: information of active python versions, as returned by ``get_active_python_versions``
+        path: snapshot file, replaced atomically
+        created: creation timestamp, default to now
+    """
+    _path = Path(path)
+    _created = time.time() if created is None else created
+    _content = json.dumps(
+        {'format': SNAPSHOT_FORMAT, 'created': _created, 'versions': versions}, separators=(',', ':')
+    ).encode()
+    if _path.suffix == '.gz':
+        _content = gzip.compress(_content, mtime=0)
+    write_atomically(_path, _content)
+
+
+def load_snapshot(path: Union[str, Path]) -> Tuple[float, List[dict]]:
+    """Read a snapshot file written by ``export_snapshot``.
+
+    Arguments:
+        path: snapshot file, gzip compressed when its name ends with ``.gz``
+
+    Returns:
+        creation timestamp and active python versions
+
+    Raises:
+        ValueError: not a snapshot file, or written with an unsupported format
+    """
+    _path = Path(path)
+    _content = _path.read_bytes()
+    if _path.suffix == '.gz':
+        _content = gzip.decompress(_content)
+    try:
+        _snapshot = json.loads(_content)
+        _format = _snapshot['format']
+    except (ValueError, TypeError, KeyError) as exc:
+        raise ValueError(f"{path} is not a snapshot file") from exc
+    if _format != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported snapshot format {_format}, expected {SNAPSHOT_FORMAT}")
+    return _snapshot['created'], _snapshot['versions']
+
+
+def select_versions(
+    versions: List[dict], docker_images: bool, no_main: bool, tag_filter: Optional[TagFilter] = None
+) -> List[dict]:
+    """Return snapshot versions as if they were fetched with given arguments.
+
+    Arguments:
+        versions: active python versions read from a snapshot
+        docker_images: flag to return also available docker images
+        no_main: Filter out "main" branch that has no explicit version numbering.
+        tag_filter: docker tags selection by name, snapshots have no tag architectures
+
+    Returns:
+        selected active python versions
+
+    Raises:
+        LookupError: docker images requested but not included into the snapshot
+        ValueError: architecture tag filter given
+    """
+    _selected = [_v for _v in versions if not (no_main and _v['version'] == 'main')]
+    if docker_images:
+        if any('docker_images' not in _v for _v in _selected):
+            raise LookupError("Snapshot has no docker images, export it with docker images")
+        if tag_filter is None:
+            return _selected
+        if tag_filter.arch is not None:
+            raise ValueError("Architecture tag filter can't be used with snapshots, they have no tag images")
+        return [_filtered_tags(_v, tag_filter) for _v in _selected]
+    return [{_k: _i for _k, _i in _v.items() if _k not in ('docker_images', 'docker_packages')} for _v in _selected]
+
+
+def _filtered_tags(version: dict, tag_filter: TagFilter) -> dict:
+    """Return a copy of the version with only its docker tags selected by the filter.
+
+    Arguments:
+        version: active python version read from a snapshot
+        tag_filter: docker tags selection by name
+
+    Returns:
+        version with selected docker tags
+    """
+    _version = dict(version)
+    _version['docker_images'] = [
+        _t for _t in version['docker_images'] if tag_filter.match_name(version['latest_sw'], _t)
+    ]
+    if 'docker_packages' in version:
+        _version['docker_packages'] = {
+            _p: [_t for _t in _tags if tag_filter.match_name(version['latest_sw'], _t)]
+            for _p, _tags in version['docker_packages'].items()
+        }
+    return _version
@@ -0,0 +1,135 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Selection of docker tags, applied while tag pages are fetched."""
+import re
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+FILTER_KINDS = ('prefix', 'regex', 'variant', 'arch')
+
+
+def starts_with(tag: str, prefix: str) -> bool:
+    """Return if the tag starts with given prefix, on a version boundary.
+
+    A prefix ending with a digit isn't followed by another one, so ``3.1`` matches ``3.1.4-slim`` but not ``3.10``.
+
+    Arguments:
+        tag: docker tag name
+        prefix: version or any tag prefix
+
+    Returns:
+        True if the tag starts with the prefix
+    """
+    if not tag.startswith(prefix):
+        return False
+    return not prefix[-1:].isdigit() or not tag[len(prefix) : len(prefix) + 1].isdigit()
+
+
+class TagFilter(NamedTuple):
+    """Docker tags selection, every given criterion must match.
+
+    Tags always start with the looked up version, on a version boundary.
+    """
+
+    prefix: Optional[str] = None
+    regex: Optional[str] = None
+    variants: Tuple[str, ...] = ()
+    arch: Optional[str] = None
+
+    @classmethod
+    def parse(cls, expressions: Iterable[str]) -> 'TagFilter':
+        """Build a filter of ``kind:value`` expressions, as ``prefix:3.12``, ``variant:slim`` or ``arch:arm64``.
+
+        Arguments:
+            expressions: filter expressions, variants can be repeated
+
+        Returns:
+            tag filter
+
+        Raises:
+            ValueError: unknown kind, missing value, repeated kind other than variant or invalid regex
+        """
+        _values: dict = {}
+        _variants = []
+        for _expression in expressions:
+            _kind, _, _value = _expression.partition(':')
+            if _kind not in FILTER_KINDS or not _value:
+                raise ValueError(f"Invalid tag filter {_expression!r}, expected one of {', '.join(FILTER_KINDS)}:VALUE")
+            if _kind == 'variant':
+                _variants.append(_value)
+                continue
+            if _kind in _values:
+                raise ValueError(f"Tag filter {_kind} given more than once")
+            if _kind == 'regex':
+                try:
+                    re.compile(_value)
+                except re.error as exc:
+                    raise ValueError(f"Invalid tag filter regex {_value!r}: {exc}") from exc
+            _values[_kind] = _value
+        return cls(variants=tuple(_variants), **_values)
+
+    def name_filter(self, version: str) -> Optional[str]:
+        """Return docker hub name filter covering the tags of a version.
+
+        Arguments:
+            version: looked up version
+
+        Returns:
+            the longest of version and prefix, None when the prefix excludes every tag of the version
+        """
+        if self.prefix is None or starts_with(version, self.prefix):
+            return version
+        if starts_with(self.prefix, version):
+            return self.prefix
+        return None
+
+    def is_past(self, version: str, tag: str) -> bool:
+        """Return if no tag after given one can match, when tags are listed by name.
+
+        Arguments:
+            version: looked up version
+            tag: last listed tag name
+
+        Returns:
+            True once listed names sort after every name starting with the name filter
+        """
+        _name = self.name_filter(version)
+        return _name is None or tag[: len(_name)] > _name
+
+    def match_name(self, version: str, tag: str) -> bool:
+        """Return if a tag name matches every name criterion.
+
+        Arguments:
+            version: looked up version
+            tag: docker tag name
+
+        Returns:
+            True if the tag is selected, regardless of its architectures
+        """
+        if not starts_with(tag, version) or (self.prefix is not None and not starts_with(tag, self.prefix)):
+            return False
+        if self.regex is not None and not re.search(self.regex, tag):
+            return False
+        # variants are the dash separated parts after the version, as ``slim`` or ``alpine3.20``
+        _parts = tag[len(version) :].split('-')[1:]
+        return all(any(re.fullmatch(rf"{re.escape(_v)}[\d.]*", _p) for _p in _parts) for _v in self.variants)
+
+    def matches(self, version: str, result: dict) -> bool:
+        """Return if a docker hub tag result matches every criterion.
+
+        Arguments:
+            version: looked up version
+            result: tag as listed by docker hub, with its ``images``
+
+        Returns:
+            True if the tag is selected
+        """
+        if not self.match_name(version, result['name']):
+            return False
+        if self.arch is None:
+            return True
+        return any(
+            self.arch in (_i.get('architecture'), f"{_i.get('architecture')}/{_i.get('variant')}")
+            for _i in result.get('images') or []
+        )
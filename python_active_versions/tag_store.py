@@ -0,0 +1,58 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Persistent set of known docker tags, used to fetch only the new ones."""
+import json
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from python_active_versions.utility import default_cache_dir, write_atomically
+
+
+class KnownTags(NamedTuple):
+    """Docker tags already fetched for a package version."""
+
+    tags: List[str]
+    last_updated: Optional[str]
+
+
+class TagStore:
+    """Known tags stored as json files, one per package version, with their ``last_updated`` high-water mark."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """Store kept into given folder.
+
+        Arguments:
+            path: folder of tags files, default to ``tags`` folder into the user cache folder
+        """
+        self.path = Path(path) if path else default_cache_dir() / 'tags'
+
+    def _file(self, package: str, version: str) -> Path:
+        return self.path / f"{package.replace('/', '__')}-{version}.json"
+
+    def load(self, package: str, version: str) -> Optional[KnownTags]:
+        """Return known tags of a package version.
+
+        Arguments:
+            package: docker package name
+            version: version used as tag name filter
+
+        Returns:
+            known tags, None if never stored
+        """
+        try:
+            _content = json.loads(self._file(package, version).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        return KnownTags(_content['tags'], _content['last_updated'])
+
+    def save(self, package: str, version: str, known: KnownTags) -> None:
+        """Store known tags of a package version, replacing the file atomically.
+
+        Arguments:
+            package: docker package name
+            version: version used as tag name filter
+            known: tags and their high-water mark
+        """
+        write_atomically(self._file(package, version), json.dumps(known._asdict()).encode('utf-8'))
@@ -0,0 +1,215 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Resilient sending of HTTP requests: retries, rate limits, per-host concurrency and circuit breaker."""
+import email.utils
+import logging
+import random
+import threading
+import time
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from requests import ConnectionError as RequestsConnectionError
+from requests import Response, Timeout
+
+from python_active_versions.constants import HOST_CONCURRENCY
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(RequestsConnectionError):
+    """Host failed too many times in a row, or its rate limit is exhausted for longer than allowed wait."""
+
+
+class RetryPolicy(NamedTuple):
+    """How failed requests are retried."""
+
+    attempts: int = 4
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    max_wait: float = 60.0
+    statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+
+def _retry_after(response: Response) -> Optional[float]:
+    """Return the seconds to wait asked by ``Retry-After`` header, given in seconds or as HTTP date.
+
+    Arguments:
+        response: failed response
+
+    Returns:
+        seconds to wait, None without a valid header
+    """
+    _value = response.headers.get('Retry-After')
+    if not _value:
+        return None
+    if _value.strip().isdigit():
+        return float(_value)
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(_value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _rate_limit_reset(response: Response) -> Optional[float]:
+    """Return when the rate limit window resets, if the response used its last allowed request.
+
+    Docker Hub sends ``ratelimit-remaining`` as ``<remaining>;w=<window seconds>``, others as a plain number;
+    the reset comes from ``ratelimit-reset``, an epoch timestamp, falling back to the window length.
+
+    Arguments:
+        response: any response
+
+    Returns:
+        epoch timestamp of rate limit reset, None while requests are still allowed
+    """
+    _headers = response.headers
+    _remaining = _headers.get('RateLimit-Remaining') or _headers.get('X-RateLimit-Remaining')
+    if _remaining is None:
+        return None
+    _count, _, _window = _remaining.partition(';w=')
+    try:
+        if int(_count) > 0:
+            return None
+    except ValueError:
+        return None
+    _reset = _headers.get('RateLimit-Reset') or _headers.get('X-RateLimit-Reset')
+    if _reset and _reset.isdigit():
+        # either an epoch timestamp or, as RateLimit header fields draft, seconds from now
+        return float(_reset) if int(_reset) > 1e9 else time.time() + int(_reset)
+    return time.time() + (int(_window) if _window.isdigit() else 60)
+
+
+def _past(deadline: Optional[float], wait: float) -> bool:
+    """Return if waiting given seconds would end after the deadline.
+
+    Arguments:
+        deadline: ``time.monotonic`` time, None if unbounded
+        wait: seconds to wait
+
+    Returns:
+        True if the wait ends after the deadline
+    """
+    return deadline is not None and time.monotonic() + wait > deadline
+
+
+class _HostState:
+    """Concurrency, rate limit and circuit state of a single host."""
+
+    def __init__(self, concurrency: int):
+        self.semaphore = threading.BoundedSemaphore(concurrency)
+        self.blocked_until = 0.0
+        self.failures = 0
+        self.open_until = 0.0
+
+
+class Transport:
+    """Send requests through a retry policy, respecting per-host concurrency, rate limits and circuit breaker."""
+
+    def __init__(
+        self,
+        policy: RetryPolicy = RetryPolicy(),
+        host_concurrency: int = HOST_CONCURRENCY,
+        failure_threshold: int = 5,
+        cooldown: float = 30.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Transport without any host state.
+
+        Arguments:
+            policy: retry policy of failed requests
+            host_concurrency: requests in flight at the same time toward a host
+            failure_threshold: consecutive failed requests opening the circuit of a host
+            cooldown: seconds an open circuit refuses requests
+            sleep: function waiting given seconds, replaceable by tests
+        """
+        self.policy = policy
+        self.host_concurrency = host_concurrency
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._sleep = sleep
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def _host(self, host: str) -> _HostState:
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = _HostState(self.host_concurrency)
+            return self._hosts[host]
+
+    def _delay(self, attempt: int, response: Optional[Response]) -> float:
+        _asked = _retry_after(response) if response is not None else None
+        if _asked is not None:
+            return _asked
+        # full jitter, spreading retries of concurrent workers
+        return random.uniform(0, min(self.policy.max_backoff, self.policy.backoff * 2**attempt))  # nosec B311
+
+    def _record(self, state: _HostState, failed: bool) -> None:
+        with self._lock:
+            if not failed:
+                state.failures = 0
+                return
+            state.failures += 1
+            if state.failures >= self.failure_threshold:
+                state.open_until = time.time() + self.cooldown
+
+    def send(self, host: str, call: Callable[[], Response], deadline: Optional[float] = None) -> Tuple[Response, int]:
+        """Send a request toward a host, retrying it when it fails.
+
+        A wait ending after ``deadline`` is never started: the last failure is returned, or raised, at once.
+
+        Arguments:
+            host: host receiving the request
+            call: function sending the request once
+            deadline: ``time.monotonic`` time the request must end by, retries included; None if unbounded
+
+        Returns:
+            last response and number of retries done
+
+        Raises:
+            CircuitOpenError: host circuit is open, or its rate limit resets after policy ``max_wait``
+            RequestsConnectionError: last attempt couldn't connect
+            Timeout: last attempt timed out, or rate limit resets after ``deadline``
+        """
+        _state = self._host(host)
+        if _state.open_until > time.time():
+            raise CircuitOpenError(f"Too many failures from {host}, retry in {_state.open_until - time.time():.0f}s")
+
+        _attempt = 0
+        while True:
+            _wait = _state.blocked_until - time.time()
+            if _wait > self.policy.max_wait:
+                raise CircuitOpenError(f"Rate limit of {host} reached, it resets in {_wait:.0f}s")
+            if _wait > 0 and _past(deadline, _wait):
+                raise Timeout(f"Rate limit of {host} resets in {_wait:.0f}s, after the overall deadline")
+            if _wait > 0:
+                logger.warning("Rate limit of %s reached, waiting %.1fs", host, _wait)
+                self._sleep(_wait)
+            _last = _attempt == self.policy.attempts - 1
+            try:
+                with _state.semaphore:
+                    response = call()
+            except (RequestsConnectionError, Timeout):
+                _delay = self._delay(_attempt, None)
+                if _last or _past(deadline, _delay):
+                    self._record(_state, failed=True)
+                    raise
+                self._sleep(_delay)
+                _attempt += 1
+                continue
+
+            _reset = _rate_limit_reset(response)
+            if _reset is not None:
+                with self._lock:
+                    _state.blocked_until = max(_state.blocked_until, _reset)
+            if response.status_code not in self.policy.statuses:
+                self._record(_state, failed=False)
+                return response, _attempt
+            _delay = self._delay(_attempt, response)
+            if _last or _delay > self.policy.max_wait or _past(deadline, _delay):
+                self._record(_state, failed=True)
+                return response, _attempt
+            logger.info("Retrying %s after %s, in %.1fs", host, response.status_code, _delay)
+            self._sleep(_delay)
+            _attempt += 1
@@ -4,7 +4,11 @@
 
 """Module with utility methods."""
 
+import contextlib
 import logging
+import os
+import tempfile
+from pathlib import Path
 
 
 def configure_logger(level: str = 'info') -> None:
@@ -27,3 +31,39 @@ def configure_logger(level: str = 'info') -> None:
         format='%(asctime)s [%(levelname)s - %(filename)s:%(lineno)d]    %(message)s',
         handlers=None,
     )
+
+
+def default_cache_dir() -> Path:
+    """Return the folder where the tool stores its cached data.
+
+    ``PYTHON_ACTIVE_VERSIONS_CACHE_DIR`` environment variable takes precedence over the user cache folder.
+
+    Returns:
+        cache folder path, not created
+    """
+    if 'PYTHON_ACTIVE_VERSIONS_CACHE_DIR' in os.environ:
+        return Path(os.environ['PYTHON_ACTIVE_VERSIONS_CACHE_DIR'])
+    _base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(_base) / 'python-active-versions'
+
+
+def write_atomically(path: Path, content: bytes) -> None:
+    """Replace a file with given content, readers never see it partially written.
+
+    Content goes into a temporary file of the same folder, then moved over ``path``; the temporary file is
+    removed when writing or moving it fails.
+
+    Arguments:
+        path: file to be written, its folder is created if missing
+        content: new file content
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _fd, _name = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(_fd, 'wb') as _tmp:
+            _tmp.write(content)
+        os.replace(_name, path)
+    finally:
+        # already gone once moved, left behind by a failed write otherwise
+        with contextlib.suppress(OSError):
+            os.unlink(_name)
@@ -4,10 +4,27 @@
 
 """Pytest conftest."""
 
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Tuple
+from unittest.mock import MagicMock
+from urllib.parse import parse_qs, urlsplit
+
 import pytest
 from click.testing import CliRunner
 
 
+@pytest.fixture(autouse=True)
+def memory_http_cache(monkeypatch):
+    """Keep HTTP cache in memory, tests must not read or write the cache of the working directory.
+
+    Arguments:
+        monkeypatch: pytest monkeypatch
+    """
+    monkeypatch.setenv('PYTHON_ACTIVE_VERSIONS_HTTP_CACHE_BACKEND', 'memory')
+
+
 @pytest.fixture(scope="function")
 def runner(request):
     """Pytest runner fixture.
@@ -19,3 +36,163 @@ def runner(request):
         Click CliRunner object
     """
     return CliRunner()
+
+
+DEVGUIDE_HTML = """
+<section id="status-of-python-versions"><table><thead><tr>
+<th>Branch</th><th>Schedule</th><th>Status</th><th>First release</th><th>End of life</th><th>Release manager</th>
+</tr></thead><tbody>
+<tr><td><p>main</p></td><td><p>PEP 745</p></td><td><p>feature</p></td><td><p>2025-10-01</p></td>
+<td><p>2030-10</p></td><td><p>Hugo van Kemenade</p></td></tr>
+<tr><td><p>3.13</p></td><td><p>PEP 719</p></td><td><p>prerelease</p></td><td><p>2024-10-01</p></td>
+<td><p>2029-10</p></td><td><p>Thomas Wouters</p></td></tr>
+<tr><td><p>3.12</p></td><td><p>PEP 693</p></td><td><p>bugfix</p></td><td><p>2023-10-02</p></td>
+<td><p>2028-10</p></td><td><p>Thomas Wouters</p></td></tr>
+<tr><td><p>3.10</p></td><td><p>PEP 619</p></td><td><p>security</p></td><td><p>2021-10-04</p></td>
+<td><p>2026-10</p></td><td><p>Pablo Galindo Salgado</p></td></tr>
+<tr><td><p>3.1</p></td><td><p>PEP 375</p></td><td><p>end-of-life</p></td><td><p>2009-06-27</p></td>
+<td><p>2012-04-09</p></td><td><p>Benjamin Peterson</p></td></tr>
+</tbody></table></section>
+"""
+
+DOWNLOADS_HTML = """
+<div class="row download-list-widget"><ol class="list-row-container menu">
+<li><span class="release-number"><a href="/downloads/release/python-3124/">Python 3.12.4</a></span>
+<span class="release-date">June 6, 2024</span></li>
+<li><span class="release-number"><a href="/downloads/release/python-31014/">Python 3.10.14</a></span>
+<span class="release-date">March 19, 2024</span></li>
+<li><span class="release-number"><a href="/downloads/release/python-3123/">Python 3.12.3</a></span>
+<span class="release-date">April 9, 2024</span></li>
+<li><span class="release-number"><a href="/downloads/release/python-314/">Python 3.1.4</a></span>
+<span class="release-date">June 11, 2011</span></li>
+</ol></div>
+"""
+
+
+@pytest.fixture(scope="function")
+def fake_get():
+    """Fake get call serving devguide, python.org downloads and docker hub pages.
+
+    Returns:
+        callable with the same signature of session get, counting its calls into ``calls`` attribute
+    """
+
+    def _get(url, **_kwargs):
+        _get.calls.append(url)
+        _response = MagicMock()
+        if url.startswith("https://registry.hub.docker.com/"):
+            _name = parse_qs(urlsplit(url).query)['name'][0]
+            _response.json.return_value = {
+                'count': 2,
+                'next': None,
+                'results': [{'name': _name}, {'name': f"{_name}-slim"}],
+            }
+            return _response
+
+        _response.text = DEVGUIDE_HTML if url.startswith("https://devguide.python.org/") else DOWNLOADS_HTML
+        _response.content = _response.text.encode()
+        return _response
+
+    _get.calls = []
+    return _get
+
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+class _RecordedHandler(BaseHTTPRequestHandler):
+    """Stand-in for devguide, python.org and docker hub, answering with recorded responses.
+
+    Docker hub requests are collected into ``requests``, and answered with the status and headers popped from
+    ``script`` while it's not empty: an error status has an error body, a ``200`` one the recorded body.
+    """
+
+    script: List[Tuple[int, Dict[str, str]]] = []
+    requests: List[str] = []
+
+    def do_GET(self):  # noqa: N802
+        """Send the recorded response of requested path, docker pages selected by their page parameter."""
+        _url = urlsplit(self.path)
+        _status, _headers = 200, {}
+        if _url.path == '/versions/':
+            _file, _type = 'devguide_versions.html', 'text/html'
+        elif _url.path == '/downloads/':
+            _file, _type = 'downloads.html', 'text/html'
+        elif _url.path == '/v2/repositories/library/python/tags':
+            _file, _type = f"docker_tags_python_{parse_qs(_url.query).get('page', ['1'])[0]}.json", 'application/json'
+            self.requests.append(self.path)
+            if self.script:
+                _status, _headers = self.script.pop(0)
+        else:
+            _file, _type = '', ''
+        if not _file or not (FIXTURES / _file).exists():
+            self.send_error(404)
+            return
+        _base = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+        if _status == 200:
+            _body = (FIXTURES / _file).read_bytes().replace(b'{base}', _base.encode())
+        else:
+            _body = b'{"message": "error"}'
+        self.send_response(_status)
+        self.send_header('Content-Type', _type)
+        self.send_header('Content-Length', str(len(_body)))
+        for _name, _value in _headers.items():
+            self.send_header(_name, _value)
+        self.end_headers()
+        self.wfile.write(_body)
+
+    def log_message(self, *_args):
+        """Keep test output clean.
+
+        Arguments:
+            _args: log message format and its arguments, discarded
+        """
+
+
+@pytest.fixture(scope="session")
+def recorded_server():
+    """Local server answering with recorded responses.
+
+    Yields:
+        server base url
+    """
+    _server = ThreadingHTTPServer(('127.0.0.1', 0), _RecordedHandler)
+    threading.Thread(target=_server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{_server.server_address[1]}"
+    _server.shutdown()
+    _server.server_close()
+
+
+@pytest.fixture
+def recorded_urls(recorded_server, monkeypatch):
+    """Point scraped pages and docker hub to the recorded responses server.
+
+    Arguments:
+        recorded_server: server base url
+        monkeypatch: pytest monkeypatch
+
+    Returns:
+        server base url
+    """
+    _module = 'python_active_versions.python_active_versions'
+    monkeypatch.setattr(f"{_module}.DEVGUIDE_URL", f"{recorded_server}/versions/")
+    monkeypatch.setattr(f"{_module}.DOWNLOADS_URL", f"{recorded_server}/downloads/")
+    monkeypatch.setattr(f"{_module}.DOCKER_HUB_URL", f"{recorded_server}/v2/repositories")
+    return recorded_server
+
+
+@pytest.fixture
+def registry(recorded_urls):
+    """Recorded responses server answering docker hub requests with scripted statuses first.
+
+    Arguments:
+        recorded_urls: recorded responses server base url
+
+    Yields:
+        handler class, whose ``script`` of ``(status, headers)`` is consumed by docker hub requests and
+        ``requests`` collects their paths
+    """
+    _RecordedHandler.script = []
+    _RecordedHandler.requests = []
+    yield _RecordedHandler
+    _RecordedHandler.script = []
@@ -0,0 +1,124 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Benchmarks of scraping stages, run against recorded responses.
+
+Every stage keeps the best of some runs and fails when it exceeds its budget. Budgets leave about ten times
+headroom over a developer machine; ``PYTHON_ACTIVE_VERSIONS_BENCH_SCALE`` environment variable scales them for
+slower CI runners.
+"""
+
+import logging
+import os
+import time
+from typing import Callable
+
+import pytest
+
+from python_active_versions.parsers import get_parser
+from python_active_versions.python_active_versions import (
+    _fetch_tags,
+    _version_info,
+    build_session,
+    get_active_python_versions,
+)
+from python_active_versions.releases import ReleaseIndex
+from tests.conftest import FIXTURES
+
+logger = logging.getLogger(__name__)
+
+# seconds
+BUDGETS = {
+    'parse-lxml': 0.1,
+    'parse-requests-html': 5.0,
+    'match': 0.03,
+    'pagination': 0.5,
+    'end-to-end': 2.5,
+}
+
+
+def _check_budget(stage: str, run: Callable[[], object], repeat: int = 5) -> float:
+    """Time the best of some runs of a stage and check it against its budget.
+
+    Arguments:
+        stage: stage name, key of BUDGETS
+        run: stage to be timed
+        repeat: runs of the stage
+
+    Returns:
+        best timing, in seconds
+    """
+    _best = float('inf')
+    for _ in range(repeat):
+        _start = time.perf_counter()
+        run()
+        _best = min(_best, time.perf_counter() - _start)
+    _budget = BUDGETS[stage] * float(os.environ.get('PYTHON_ACTIVE_VERSIONS_BENCH_SCALE', '1'))
+    logger.info("%s: %.2f ms, budget %.2f ms", stage, _best * 1000, _budget * 1000)
+    assert _best < _budget, f"{stage} took {_best:.3f}s, over its {_budget:.3f}s budget"
+    return _best
+
+
+@pytest.mark.parametrize('parser', ['lxml', 'requests-html'])
+def test_parse_stage(parser):
+    """Benchmark extraction of versions table and releases from recorded pages.
+
+    Arguments:
+        parser: HTML parser name
+    """
+    _parser = get_parser(parser)
+    _devguide = (FIXTURES / 'devguide_versions.html').read_bytes()
+    _downloads = (FIXTURES / 'downloads.html').read_bytes()
+    assert [_r[0] for _r in _parser.version_rows(_devguide)] == ['main', '3.13', '3.12', '3.11', '3.10', '3.9', '3.8']
+    assert len(_parser.downloadable_versions(_downloads)) == 172
+
+    def _parse():
+        _parser.version_rows(_devguide)
+        _parser.downloadable_versions(_downloads)
+
+    _check_budget(f"parse-{parser}", _parse, repeat=3 if parser == 'requests-html' else 5)
+
+
+def test_match_stage():
+    """Benchmark matching of devguide branches with their latest release."""
+    _parser = get_parser()
+    _rows = _parser.version_rows((FIXTURES / 'devguide_versions.html').read_bytes())
+    _releases = _parser.downloadable_versions((FIXTURES / 'downloads.html').read_bytes())
+
+    def _match():
+        _index = ReleaseIndex(_releases)
+        return [_version_info(_row, _index, True) for _row in _rows]
+
+    assert [_v['latest_sw'] for _v in _match() if _v] == ['3.13.0b3', '3.12.4', '3.11.9', '3.10.14', '3.9.19', '3.8.19']
+    _check_budget('match', _match)
+
+
+def test_pagination_stage(recorded_urls):
+    """Benchmark docker hub pages fetch, served by the local stand-in registry.
+
+    Arguments:
+        recorded_urls: recorded responses server base url
+    """
+
+    def _paginate():
+        return _fetch_tags('python', '3.12.4', session=build_session(cache_backend='memory'))
+
+    assert len(_paginate()) == 250
+    _check_budget('pagination', _paginate)
+
+
+def test_end_to_end(recorded_urls):
+    """Benchmark a whole lookup with docker images, served by the local stand-in servers.
+
+    Arguments:
+        recorded_urls: recorded responses server base url
+    """
+
+    def _lookup():
+        return get_active_python_versions(docker_images=True, cache_backend='memory')
+
+    _versions = _lookup()
+    assert len(_versions) == 6
+    assert len(_versions[1]['docker_images']) == 250
+    _check_budget('end-to-end', _lookup, repeat=3)
@@ -0,0 +1,99 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Tests for results history and diff."""
+
+import json
+from unittest.mock import patch
+
+from python_active_versions.cli_tools.cli import get_python_versions
+from python_active_versions.history import Change, History, diff_versions
+
+_OLD = [
+    {'version': '3.12', 'latest_sw': '3.12.3', 'start': '2023-10-02', 'end': '2028-10', 'docker_images': ['3.12.3']},
+    {'version': '3.8', 'latest_sw': '3.8.19', 'start': '2019-10-14', 'end': '2024-10', 'docker_images': ['3.8.19']},
+]
+_NEW = [
+    {'version': '3.13', 'latest_sw': '3.13.0b3', 'start': '2024-10-01', 'end': '2029-10', 'docker_images': []},
+    {
+        'version': '3.12',
+        'latest_sw': '3.12.4',
+        'start': '2023-10-02',
+        'end': '2028-10-31',
+        'docker_images': ['3.12.4', '3.12.4-slim'],
+    },
+]
+
+
+def test_diff_versions():
+    """Test branches, releases, end of life and docker tags changes."""
+    assert diff_versions(_OLD, _NEW) == [
+        Change('added', '3.13', None, '3.13.0b3'),
+        Change('release', '3.12', '3.12.3', '3.12.4'),
+        Change('end-of-life', '3.12', '2028-10', '2028-10-31'),
+        Change('tag-added', '3.12', None, '3.12.4', 'python'),
+        Change('tag-added', '3.12', None, '3.12.4-slim', 'python'),
+        Change('tag-removed', '3.12', '3.12.3', None, 'python'),
+        Change('removed', '3.8', '3.8.19', None),
+    ]
+    assert diff_versions(_NEW, _NEW) == []
+    # tags are not compared when one of the results has none
+    _without_tags = [{_k: _i for _k, _i in _v.items() if _k != 'docker_images'} for _v in _NEW]
+    assert diff_versions(_without_tags, _NEW) == []
+
+
+def test_history_record_and_load(tmp_path):
+    """Test results are recorded only when changed, looked up by time and pruned.
+
+    Arguments:
+        tmp_path: pytest temporary folder
+    """
+    _history = History(tmp_path, size=2)
+    assert _history.load() is None
+    assert _history.diff(_OLD)[0] == Change('added', '3.12', None, '3.12.3')
+
+    assert _history.record(_OLD, 1000.0)
+    assert not _history.record(_OLD, 2000.0)
+    assert _history.record(_NEW, 3000.0)
+    assert _history.entries() == [1000.0, 3000.0]
+    assert _history.load() == _NEW
+    assert _history.load(2999.0) == _OLD
+    assert _history.load(10.0) == _OLD
+    assert _history.diff(_NEW) == []
+    assert len(_history.diff(_NEW, since=1500.0)) == 7
+
+    assert _history.record(_OLD, 4000.0)
+    assert _history.entries() == [3000.0, 4000.0]
+
+
+def test_cli_diff(runner, fake_get, tmp_path):
+    """Test diff subcommand prints changes since the previous run, then nothing.
+
+    Arguments:
+        runner: Click runner
+        fake_get: fake pages
+        tmp_path: pytest temporary folder
+    """
+    _history = tmp_path / 'history'
+    with patch('python_active_versions.python_active_versions.CachedHTMLSession.get', side_effect=fake_get):
+        result = runner.invoke(get_python_versions, ['diff', '--history-dir', str(_history)])
+        assert result.exit_code == 0
+        assert result.output.splitlines()[0] == '3.13: added, latest release 3.13'
+
+        result = runner.invoke(get_python_versions, ['diff', '--history-dir', str(_history)])
+        assert result.output == 'No changes\n'
+
+        # docker images have their own history
+        result = runner.invoke(
+            get_python_versions, ['-d', 'diff', '--history-dir', str(_history), '--format', 'ndjson']
+        )
+        assert result.exit_code == 0
+        assert json.loads(result.output.splitlines()[1]) == {
+            'kind': 'added',
+            'version': '3.12',
+            'old': None,
+            'new': '3.12.4',
+            'package': None,
+        }
+    assert len(list(_history.iterdir())) == 2
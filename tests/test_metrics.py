@@ -0,0 +1,93 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Tests for HTTP and stage instrumentation."""
+
+from python_active_versions.cli_tools.cli import get_python_versions
+from python_active_versions.metrics import HttpEvent, StageEvent, StatsCollector, metrics
+from python_active_versions.python_active_versions import build_session, get_active_python_versions
+
+
+def test_http_events(recorded_urls):
+    """Test every HTTP call is reported with its cache origin, size and latency.
+
+    Arguments:
+        recorded_urls: recorded responses server base url
+    """
+    _events = []
+    metrics.add_hook(_events.append)
+    try:
+        _session = build_session(cache_backend='memory')
+        _session.get(f"{recorded_urls}/downloads/")
+        _session.get(f"{recorded_urls}/downloads/")
+    finally:
+        metrics.remove_hook(_events.append)
+    _session.get(f"{recorded_urls}/downloads/")
+
+    assert [type(_e) for _e in _events] == [HttpEvent, HttpEvent]
+    assert [_e.from_cache for _e in _events] == [False, True]
+    assert _events[0].url == f"{recorded_urls}/downloads/"
+    assert _events[0].status == 200
+    assert _events[0].bytes == _events[1].bytes > 0
+    assert _events[0].latency > 0
+    assert _events[0].retries == 0
+
+
+def test_stage_events(recorded_urls):
+    """Test scraping stages and docker workers are timed.
+
+    Arguments:
+        recorded_urls: recorded responses server base url
+    """
+    _collector = StatsCollector()
+    metrics.add_hook(_collector)
+    try:
+        get_active_python_versions(docker_images=True, cache_backend='memory')
+    finally:
+        metrics.remove_hook(_collector)
+
+    assert list(_collector.stages) == ['pages', 'parse', 'match', 'docker-tags']
+    assert len(_collector.stages['docker-tags']) == 6
+    # devguide, downloads and three docker pages per branch, recorded next pages are shared by every branch
+    assert len(_collector.http) == 20
+    assert _collector.summary().startswith('HTTP requests: 20, cache hits: ')
+    assert isinstance(StageEvent('parse', None, 0.1), tuple)
+
+
+def test_failing_hook(recorded_urls, caplog):
+    """Test a failing hook is logged, other hooks and the lookup go on.
+
+    Arguments:
+        recorded_urls: recorded responses server base url
+        caplog: pytest log capture
+    """
+
+    def _broken(_event):
+        raise RuntimeError('broken hook')
+
+    _collector = StatsCollector()
+    metrics.add_hook(_broken)
+    metrics.add_hook(_collector)
+    try:
+        assert get_active_python_versions(cache_backend='memory')
+    finally:
+        metrics.remove_hook(_broken)
+        metrics.remove_hook(_collector)
+    assert len(_collector.http) == 2
+    assert 'Metrics hook' in caplog.text and 'broken hook' in caplog.text
+
+
+def test_cli_stats(runner, recorded_urls):
+    """Test --stats prints the summary without changing the output.
+
+    Arguments:
+        runner: Click runner
+        recorded_urls: recorded responses server base url
+    """
+    result = runner.invoke(get_python_versions, ['--stats', '--output', 'json', '--http-cache-backend', 'memory'])
+    assert result.exit_code == 0
+    assert result.stdout.startswith('[')
+    assert 'HTTP requests: 2, cache hits: 0' in result.stderr
+    assert 'Stage parse: 1 x' in result.stderr
+    assert not metrics.active
@@ -0,0 +1,78 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Tests for typed version records."""
+
+import datetime
+import json
+from unittest.mock import patch
+
+import pytest
+
+from python_active_versions.models import VersionInfo, parse_date
+from python_active_versions.python_active_versions import get_active_python_versions
+
+_INFO = {
+    'version': '3.12',
+    'latest_sw': '3.12.4',
+    'start': '2023-10-02',
+    'end': '2028-10',
+    'docker_images': ['3.12.4', '3.12.4-slim'],
+}
+
+
+@pytest.mark.parametrize(
+    'text, end_of_month, expected',
+    [
+        ('2023-10-02', False, datetime.date(2023, 10, 2)),
+        ('2028-10', False, datetime.date(2028, 10, 1)),
+        ('2028-02', True, datetime.date(2028, 2, 29)),
+        ('2025-10-07 (planned)', False, datetime.date(2025, 10, 7)),
+        ('TBD', False, None),
+    ],
+)
+def test_parse_date(text, end_of_month, expected):
+    """Test devguide dates parsing.
+
+    Arguments:
+        text: date text
+        end_of_month: month without day is its last day
+        expected: parsed date
+    """
+    assert parse_date(text, end_of_month) == expected
+
+
+def test_version_info():
+    """Test typed attributes and dict view of a record."""
+    _info = VersionInfo.from_dict(_INFO)
+    assert _info.start == datetime.date(2023, 10, 2)
+    assert _info.end == datetime.date(2028, 10, 31)
+    assert _info.docker_images == ('3.12.4', '3.12.4-slim')
+    assert _info['end'] == '2028-10'
+    assert 'docker_packages' not in _info
+    assert dict(_info) == _INFO
+    assert json.loads(json.dumps(_info.as_dict())) == _INFO
+    # the mapping view gives new lists, the record keeps its tags
+    _info['docker_images'].append('3.12.4-alpine')
+    assert _info['docker_images'] == ['3.12.4', '3.12.4-slim']
+    _packages = VersionInfo.from_dict({**_INFO, 'docker_packages': {'pypy': ['3.12.4']}})
+    assert json.loads(json.dumps(_packages.as_dict()))['docker_packages'] == {'pypy': ['3.12.4']}
+    assert not hasattr(_info, '__dict__')
+    assert _info.is_end_of_life(datetime.date(2028, 11, 1))
+    assert not _info.is_end_of_life(datetime.date(2028, 10, 31))
+
+
+@patch('python_active_versions.python_active_versions.CachedHTMLSession.get')
+def test_get_typed_versions(patched_get, fake_get):
+    """Test records returned in place of plain dicts.
+
+    Arguments:
+        patched_get: patched get call
+        fake_get: fake pages
+    """
+    patched_get.side_effect = fake_get
+    _versions = get_active_python_versions(docker_images=True, typed=True)
+    assert all(isinstance(_v, VersionInfo) for _v in _versions)
+    assert [_v.version for _v in _versions if not _v.is_end_of_life(datetime.date(2027, 1, 1))] == ['3.13', '3.12']
+    assert _versions[1].docker_images == ('3.12.4', '3.12.4-slim')
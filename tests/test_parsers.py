@@ -0,0 +1,31 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Test parsers module."""
+
+import pytest
+
+from python_active_versions.parsers import PARSERS, LxmlParser, get_parser
+from tests.conftest import DEVGUIDE_HTML, DOWNLOADS_HTML
+
+
+@pytest.mark.parametrize('name', list(PARSERS))
+def test_parsers(name):
+    """Test every parser extracts same data.
+
+    Arguments:
+        name: parser name
+    """
+    _parser = get_parser(name)
+    _rows = _parser.version_rows(DEVGUIDE_HTML.encode())
+    assert [_r[0] for _r in _rows] == ['main', '3.13', '3.12', '3.10', '3.1']
+    assert _rows[2] == ['3.12', 'PEP 693', 'bugfix', '2023-10-02', '2028-10', 'Thomas Wouters']
+    assert _parser.downloadable_versions(DOWNLOADS_HTML.encode()) == ['3.12.4', '3.10.14', '3.12.3', '3.1.4']
+
+
+def test_get_parser():
+    """Test parser lookup by name."""
+    assert isinstance(get_parser(), LxmlParser)
+    with pytest.raises(ValueError, match='Unknown parser'):
+        get_parser('html5lib')
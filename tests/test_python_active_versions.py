@@ -6,19 +6,41 @@
 
 """Tests for `python_active_versions` package."""
 
+import asyncio
+import json
 import logging
-from unittest.mock import patch
+import subprocess  # nosec B404
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from requests_cache import DO_NOT_CACHE
 
 from python_active_versions import __version__
 from python_active_versions.cli_tools.cli import get_python_versions
+from python_active_versions.python_active_versions import (
+    DOCKER_HUB_MAX_PAGE_SIZE,
+    ActiveVersionsError,
+    _fetch_tags,
+    _sync_tags,
+    build_session,
+    fetch_docker_tags,
+    get_active_python_versions,
+    get_active_python_versions_async,
+    iter_active_python_versions,
+)
+from python_active_versions.result_cache import ResultCache
+from python_active_versions.tag_store import TagStore
 
 logger = logging.getLogger(__name__)
 
 
 def test_py_version():
     """Dummy test to print python version used by pytest."""
-    import sys
-
     logger.info(f"in TEST: {sys.version}  -- {sys.version_info}")
     # if sys.version_info <= (3, 9, 18):
     #     # 3.9 OK
@@ -59,5 +81,638 @@ def test_api_calls(patched_get, runner):
         runner: Click runner
     """
     _ = runner.invoke(get_python_versions, [])
-    patched_get.assert_any_call("https://devguide.python.org/versions/")
-    patched_get.assert_any_call("https://www.python.org/downloads/")
+    patched_get.assert_any_call("https://devguide.python.org/versions/", timeout=120)
+    patched_get.assert_any_call("https://www.python.org/downloads/", timeout=120)
+
+
+def _docker_hub_pages(pages: dict):
+    """Build a fake docker hub get call serving given pages.
+
+    Arguments:
+        pages: page number to page json content
+
+    Returns:
+        callable to be used as patched get side effect
+    """
+
+    def _get(url, **_kwargs):
+        _query = parse_qs(urlsplit(url).query)
+        _response = MagicMock()
+        _response.json.return_value = pages[int(_query.get('page', ['1'])[0])]
+        return _response
+
+    return _get
+
+
+@patch('python_active_versions.python_active_versions.CachedHTMLSession.get')
+def test_fetch_tags_pages(patched_get):
+    """Test docker tags pages are all fetched and merged in page order.
+
+    Arguments:
+        patched_get: patched get call
+    """
+    _next = 'https://registry.hub.docker.com/v2/repositories/library/python/tags?name=3.12&page=2&page_size=2'
+    patched_get.side_effect = _docker_hub_pages(
+        {
+            1: {'count': 5, 'next': _next, 'results': [{'name': 'a'}, {'name': 'b'}]},
+            2: {'count': 5, 'next': _next.replace('page=2', 'page=3'), 'results': [{'name': 'c'}, {'name': 'd'}]},
+            3: {'count': 5, 'next': None, 'results': [{'name': 'e'}]},
+        }
+    )
+    assert _fetch_tags('python', '3.12', page_size=2) == ['a', 'b', 'c', 'd', 'e']
+    assert patched_get.call_count == 3
+    assert all('page_size=2' in _c.args[0] for _c in patched_get.call_args_list)
+
+
+@patch('python_active_versions.python_active_versions.CachedHTMLSession.get')
+def test_fetch_tags_max_page_size(patched_get):
+    """Test docker tags page size is capped and a single next page is followed.
+
+    Arguments:
+        patched_get: patched get call
+    """
+    _next = 'https://registry.hub.docker.com/v2/repositories/library/python/tags?name=3.12&page=2&page_size=100'
+    patched_get.side_effect = _docker_hub_pages(
+        {
+            1: {'count': 101, 'next': _next, 'results': [{'name': str(_i)} for _i in range(100)]},
+            2: {'count': 101, 'next': None, 'results': [{'name': '100'}]},
+        }
+    )
+    assert len(_fetch_tags('python', '3.12', page_size=1000)) == 101
+    assert f'page_size={DOCKER_HUB_MAX_PAGE_SIZE}' in patched_get.call_args_list[0].args[0]
+    assert patched_get.call_args_list[1].args[0] == _next
+
+
+def test_build_session_pool():
+    """Test shared session keeps a connection pool sized for its threads."""
+    _session = build_session(7)
+    _adapter = _session.get_adapter('https://registry.hub.docker.com')
+    assert _adapter._pool_maxsize == 7
+    assert _adapter is _session.get_adapter('https://www.python.org')
+
+
+@patch('python_active_versions.python_active_versions.build_session')
+def test_fetch_tags_shared_session(patched_build):
+    """Test docker tags fetch reuses the given session.
+
+    Arguments:
+        patched_build: patched session builder
+    """
+    _session = MagicMock()
+    _session.get.return_value.json.return_value = {'count': 1, 'next': None, 'results': [{'name': '3.12'}]}
+    assert _fetch_tags('python', '3.12', session=_session) == ['3.12']
+    patched_build.assert_not_called()
+
+
+@patch('python_active_versions.python_active_versions.CachedHTMLSession.get')
+def test_get_active_python_versions(patched_get, fake_get):
+    """Test versions are matched with their latest release and docker images.
+
+    Arguments:
+        patched_get: patched get call
+        fake_get: fake pages
+    """
+    patched_get.side_effect = fake_get
+    _versions = sorted(get_active_python_versions(docker_images=True), key=lambda _v: _v['version'])
+    assert [_v['version'] for _v in _versions] == ['3.1', '3.10', '3.12', '3.13']
+    _312 = _versions[2]
+    assert _312['latest_sw'] == '3.12.4'
+    assert _312['start'] == '2023-10-02'
+    assert _312['end'] == '2028-10'
+    assert _312['docker_images'] == ['3.12.4', '3.12.4-slim']
+
+
+@patch('python_active_versions.python_active_versions.CachedHTMLSession.get')
+def test_get_active_python_versions_async(patched_get, fake_get):
+    """Test asyncio engine returns the same information of the threaded one.
+
+    Arguments:
+        patched_get: patched get call
+        fake_get: fake pages
+    """
+    patched_get.side_effect = fake_get
+    _versions = asyncio.run(get_active_python_versions_async(docker_images=True, concurrency=2))
+    assert [_v['version'] for _v in _versions] == ['3.13', '3.12', '3.10', '3.1']
+    assert _versions[1]['docker_images'] == ['3.12.4', '3.12.4-slim']
+    assert len(fake_get.calls) == 6
+
+
+def test_async_cancel_does_not_block_loop():
+    """Test a cancelled lookup returns at once, leaving blocking gets in flight to their threads."""
+    _release = threading.Event()
+
+    def _blocked_get(*_args, **_kwargs):
+        _release.wait(5)
+        raise ConnectionError('released')
+
+    async def _cancelled():
+        _start = time.perf_counter()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(get_active_python_versions_async(cache_backend='memory'), 0.2)
+        return time.perf_counter() - _start
+
+    with patch('python_active_versions.python_active_versions.CachedHTMLSession.get', side_effect=_blocked_get):
+        try:
+            assert asyncio.run(_cancelled()) < 1
+        finally:
+            _release.set()
+
+
+def test_cli_async(runner, fake_get):
+    """Test --async cli switch.
+
+    Arguments:
+        runner: Click runner
+        fake_get: fake pages
+    """
+    with patch('python_active_versions.python_active_versions.CachedHTMLSession.get', side_effect=fake_get):
+        result = runner.invoke(get_python_versions, ['--async', '--docker'])
+    assert result.exit_code == 0
+    assert 'Latest Software Version: 3.12.4' in result.output
+    assert '    3.12.4-slim' in result.output
+
+    result = runner.invoke(get_python_versions, ['--async', '--workers', '2'])
+    assert result.exit_code == 2
+    assert 'workers' in result.output
+
+    _release = threading.Event()
+
+    def _blocked_get(*_args, **_kwargs):
+        _release.wait(5)
+        raise ConnectionError('released')
+
+    with patch('python_active_versions.python_active_versions.CachedHTMLSession.get', side_effect=_blocked_get):
+        try:
+            _start = time.perf_counter()
+            result = runner.invoke(get_python_versions, ['--async', '--timeout', '0.2'])
+            assert time.perf_counter() - _start < 1
+        finally:
+            _release.set()
+    assert result.exit_code == 1
+    assert 'not collected in 0.2 seconds' in result.output
+
+
+def test_cli_lazy_imports():
+    """Test cli module import stays light, heavy dependencies are loaded only when fetching."""
+    _result = subprocess.run(  # noqa: S603  # nosec B603
+        [sys.executable, '-X', 'importtime', '-c', 'import python_active_versions.cli_tools.cli'],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    _imported = {}
+    for _line in _result.stderr.splitlines():
+        _parts = _line.split('|')
+        if len(_parts) == 3 and _parts[1].strip().isdigit():
+            _imported[_parts[2].strip()] = int(_parts[1])
+    for _heavy in ('requests', 'requests_cache', 'requests_html', 'lxml', 'bs4', 'pyppeteer', 'icecream', 'asyncio'):
+        assert _heavy not in _imported
+    # cumulative microseconds, generous budget to catch only heavy imports coming back
+    assert _imported['python_active_versions.cli_tools.cli'] < 300000
+
+
+def test_library_skips_requests_html():
+    """Test library import doesn't load requests-html, needed only by its parser."""
+    _result = subprocess.run(  # noqa: S603  # nosec B603
+        [
+            sys.executable,
+            '-c',
+            'import sys, python_active_versions.python_active_versions as m; '
+            'print(sorted({"requests_html", "pyppeteer"} & set(sys.modules)))',
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert _result.stdout.strip() == '[]'
+
+
+def test_cli_offline(runner, tmp_path):
+    """Test --offline cli switch never fetches.
+
+    Arguments:
+        runner: Click runner
+        tmp_path: pytest temporary folder
+    """
+    with patch('python_active_versions.python_active_versions.result_cache', ResultCache(tmp_path)), patch(
+        'python_active_versions.python_active_versions.CachedHTMLSession.get'
+    ) as patched_get:
+        result = runner.invoke(get_python_versions, ['--offline'])
+        assert result.exit_code == 1
+        assert 'No cached result' in result.output
+
+        result = runner.invoke(get_python_versions, ['--refresh', '--offline'])
+        assert result.exit_code == 2
+        patched_get.assert_not_called()
+
+
+def test_build_session_page_freshness():
+    """Test scraped pages expire quickly to be revalidated, docker tags keep a long expiration."""
+    _session = build_session(page_freshness=60)
+    assert _session.settings.urls_expire_after == {'devguide.python.org': 60, 'www.python.org': 60}
+    assert _session.settings.expire_after == 604800
+    assert _session.settings.cache_control is False
+
+
+def test_build_session_cache_backend(tmp_path, monkeypatch):
+    """Test HTTP cache backend, location and expiration from arguments and environment variables.
+
+    Arguments:
+        tmp_path: pytest temporary folder
+        monkeypatch: pytest monkeypatch
+    """
+    _session = build_session(cache_backend='filesystem', cache_path=str(tmp_path / 'http'), cache_expire=10)
+    assert type(_session.cache).__name__ == 'FileCache'
+    assert _session.settings.expire_after == 10
+    assert (tmp_path / 'http').is_dir()
+
+    monkeypatch.setenv('PYTHON_ACTIVE_VERSIONS_HTTP_CACHE_BACKEND', 'sqlite')
+    monkeypatch.setenv('PYTHON_ACTIVE_VERSIONS_HTTP_CACHE_PATH', str(tmp_path / 'env_cache'))
+    monkeypatch.setenv('PYTHON_ACTIVE_VERSIONS_HTTP_CACHE_EXPIRE', '20')
+    _session = build_session()
+    assert type(_session.cache).__name__ == 'SQLiteCache'
+    assert _session.settings.expire_after == 20
+    assert (tmp_path / 'env_cache.sqlite').is_file()
+
+    assert type(build_session(cache_backend='memory').cache).__name__ == 'BaseCache'
+    with pytest.raises(ValueError, match='Unknown cache backend'):
+        build_session(cache_backend='mongodb')
+
+
+def test_sync_tags_incremental(tmp_path):
+    """Test incremental sync stops paging at already known tags.
+
+    Arguments:
+        tmp_path: pytest temporary folder
+    """
+    _store = TagStore(tmp_path)
+    _session = MagicMock()
+    _session.get.return_value.json.return_value = {
+        'count': 2,
+        'next': None,
+        'results': [
+            {'name': '3.12.4-slim', 'last_updated': '2024-07-02T10:00:00Z'},
+            {'name': '3.12.4', 'last_updated': '2024-07-01T10:00:00Z'},
+        ],
+    }
+    assert _sync_tags('python', '3.12.4', session=_session, store=_store) == ['3.12.4-slim', '3.12.4']
+    assert 'ordering=last_updated' in _session.get.call_args.args[0]
+    assert _session.get.call_args.kwargs['expire_after'] == DO_NOT_CACHE
+    assert _store.load('python', '3.12.4').last_updated == '2024-07-02T10:00:00Z'
+
+    _session.get.reset_mock()
+    _session.get.return_value.json.return_value = {
+        'count': 200,
+        'next': 'https://registry.hub.docker.com/v2/next-page-never-fetched',
+        'results': [
+            {'name': '3.12.4-alpine', 'last_updated': '2024-07-03T10:00:00Z'},
+            {'name': '3.12.4-slim', 'last_updated': '2024-07-02T10:00:00Z'},
+        ],
+    }
+    assert _sync_tags('python', '3.12.4', session=_session, store=_store) == ['3.12.4-alpine', '3.12.4-slim', '3.12.4']
+    _session.get.assert_called_once()
+    assert _session.get.call_args.kwargs['expire_after'] == DO_NOT_CACHE
+    assert _store.load('python', '3.12.4').last_updated == '2024-07-03T10:00:00Z'
+
+
+@patch('python_active_versions.python_active_versions._fetch_tags')
+@patch('python_active_versions.python_active_versions.CachedHTMLSession.get')
+def test_workers_order_and_errors(patched_get, patched_tags, fake_get):
+    """Test results keep devguide table order and failed branches are surfaced.
+
+    Arguments:
+        patched_get: patched get call
+        patched_tags: patched docker tags fetch
+        fake_get: fake pages
+    """
+    patched_get.side_effect = fake_get
+
+    def _tags(_package, version, *_args, **_kwargs):
+        # first branches complete last
+        time.sleep(0.05 if version in ('3.13', '3.12.4') else 0)
+        if version == '3.10.14':
+            raise KeyError('next')
+        return [version]
+
+    patched_tags.side_effect = _tags
+    with pytest.raises(ActiveVersionsError) as exc_info:
+        get_active_python_versions(docker_images=True, max_workers=4)
+    assert list(exc_info.value.errors) == ['3.10']
+    assert [_v['version'] for _v in exc_info.value.versions] == ['3.13', '3.12', '3.10', '3.1']
+    assert 'docker_images' not in exc_info.value.versions[2]
+    assert exc_info.value.versions[1]['docker_images'] == ['3.12.4']
+
+
+@patch('python_active_versions.python_active_versions._fetch_tags')
+@patch('python_active_versions.python_active_versions.CachedHTMLSession.get')
+def test_workers_timeout(patched_get, patched_tags, fake_get):
+    """Test overall timeout gives up slow branches without waiting them.
+
+    Arguments:
+        patched_get: patched get call
+        patched_tags: patched docker tags fetch
+        fake_get: fake pages
+    """
+    patched_get.side_effect = fake_get
+    patched_tags.side_effect = lambda _p, version, *_a, **_k: time.sleep(1 if version == '3.10.14' else 0) or []
+
+    _start = time.monotonic()
+    with pytest.raises(ActiveVersionsError) as exc_info:
+        get_active_python_versions(docker_images=True, timeout=0.2)
+    assert time.monotonic() - _start < 0.9
+    assert list(exc_info.value.errors) == ['3.10']
+
+
+def test_timeout_bounds_requests(fake_get):
+    """Test requests time out by the overall deadline, so abandoned branches end soon after it.
+
+    Arguments:
+        fake_get: fake pages
+    """
+    _timeouts = []
+    _ended = threading.Event()
+
+    def _slow_get(url, **kwargs):
+        _timeouts.append(kwargs['timeout'])
+        if 'name=3.10.14' in url:
+            # a real request gives up once its timeout expires
+            time.sleep(kwargs['timeout'])
+            _ended.set()
+            raise TimeoutError(url)
+        return fake_get(url, **kwargs)
+
+    _start = time.monotonic()
+    with patch('python_active_versions.python_active_versions.CachedHTMLSession.get', side_effect=_slow_get):
+        with pytest.raises(ActiveVersionsError):
+            get_active_python_versions(docker_images=True, timeout=0.3)
+        assert _ended.wait(2)
+    assert time.monotonic() - _start < 1
+    assert len(_timeouts) == 6 and max(_timeouts) <= 0.3
+
+
+@patch('python_active_versions.python_active_versions.CachedHTMLSession.get')
+def test_latest_release_exact_branch(patched_get, fake_get):
+    """Test branch 3.1 is not matched with 3.10 or 3.12 releases.
+
+    Arguments:
+        patched_get: patched get call
+        fake_get: fake pages
+    """
+    patched_get.side_effect = fake_get
+    _latest = {_v['version']: _v['latest_sw'] for _v in get_active_python_versions()}
+    assert _latest == {'3.13': '3.13', '3.12': '3.12.4', '3.10': '3.10.14', '3.1': '3.1.4'}
+
+
+def test_fetch_docker_tags_batch():
+    """Test many packages and versions are fetched once per package and covering name filter."""
+    _session = MagicMock()
+
+    def _get(url, **_kwargs):
+        _response = MagicMock()
+        _repository = urlsplit(url).path.split('/')[3:5]
+        _response.json.return_value = {
+            'count': 3,
+            'next': None,
+            'results': [{'name': f"{_n}-{_repository[1]}"} for _n in ('3.12.4', '3.12.3', '3.10.14')],
+        }
+        return _response
+
+    _session.get.side_effect = _get
+    _tags = fetch_docker_tags(['python', 'myorg/mirror', 'python'], ['3.12.4', '3.12', '3.10'], session=_session)
+    assert sorted(_c.args[0].split('?')[0] for _c in _session.get.call_args_list) == [
+        'https://registry.hub.docker.com/v2/repositories/library/python/tags',
+        'https://registry.hub.docker.com/v2/repositories/library/python/tags',
+        'https://registry.hub.docker.com/v2/repositories/myorg/mirror/tags',
+        'https://registry.hub.docker.com/v2/repositories/myorg/mirror/tags',
+    ]
+    assert _tags['python'] == {
+        '3.10': ['3.10.14-python'],
+        '3.12': ['3.12.4-python', '3.12.3-python'],
+        '3.12.4': ['3.12.4-python'],
+    }
+    assert _tags['myorg/mirror']['3.12.4'] == ['3.12.4-mirror']
+
+
+def test_cli_docker_packages(runner, fake_get):
+    """Test --docker-package cli option lists images of every package.
+
+    Arguments:
+        runner: Click runner
+        fake_get: fake pages
+    """
+    with patch('python_active_versions.python_active_versions.CachedHTMLSession.get', side_effect=fake_get):
+        result = runner.invoke(get_python_versions, ['-k', 'python', '-k', 'pypy'])
+        assert result.exit_code == 0
+        assert 'Docker images (python):' in result.output
+        assert 'Docker images (pypy):' in result.output
+        assert '    3.12.4-slim' in result.output
+
+        result = runner.invoke(get_python_versions, ['-k', 'pypy', '--incremental'])
+        assert result.exit_code == 2
+        with pytest.raises(ValueError, match='incremental'):
+            get_active_python_versions(True, incremental=True, docker_packages=['pypy'])
+
+
+@patch('python_active_versions.python_active_versions._fetch_tags')
+@patch('python_active_versions.python_active_versions.CachedHTMLSession.get')
+def test_iter_active_python_versions(patched_get, patched_tags, fake_get):
+    """Test versions are yielded as soon as their branch completes, failed branches raised at the end.
+
+    Arguments:
+        patched_get: patched get call
+        patched_tags: patched docker tags fetch
+        fake_get: fake pages
+    """
+    patched_get.side_effect = fake_get
+
+    def _tags(_package, version, *_args, **_kwargs):
+        time.sleep(0.2 if version == '3.13' else 0)
+        if version == '3.10.14':
+            raise KeyError('next')
+        return [version]
+
+    patched_tags.side_effect = _tags
+    _iter = iter_active_python_versions(docker_images=True, max_workers=4)
+    _first = next(_iter)
+    assert _first['version'] != '3.13'
+    assert _first['docker_images'] == [_first['latest_sw']]
+    _yielded = [_first['version']]
+    with pytest.raises(ActiveVersionsError) as exc_info:
+        _yielded.extend(_v['version'] for _v in _iter)
+    assert sorted(_yielded) == ['3.1', '3.12', '3.13']
+    assert _yielded[-1] == '3.13'
+    assert list(exc_info.value.errors) == ['3.10']
+
+
+def test_cli_stream(runner, fake_get):
+    """Test --stream cli switch prints one json line per version and nothing else.
+
+    Arguments:
+        runner: Click runner
+        fake_get: fake pages
+    """
+    with patch('python_active_versions.python_active_versions.CachedHTMLSession.get', side_effect=fake_get):
+        result = runner.invoke(get_python_versions, ['--stream', '--docker'])
+    assert result.exit_code == 0
+    _versions = {_v['version']: _v for _v in map(json.loads, result.output.splitlines())}
+    assert sorted(_versions) == ['3.1', '3.10', '3.12', '3.13']
+    assert _versions['3.12']['docker_images'] == ['3.12.4', '3.12.4-slim']
+
+    result = runner.invoke(get_python_versions, ['--stream', '--async'])
+    assert result.exit_code == 2
+
+
+@pytest.mark.parametrize('output', ['text', 'json', 'ndjson', 'csv'])
+def test_cli_output(runner, fake_get, output):
+    """Test --output formats, machine-readable ones without banner.
+
+    Arguments:
+        runner: Click runner
+        fake_get: fake pages
+        output: output format
+    """
+    with patch('python_active_versions.python_active_versions.CachedHTMLSession.get', side_effect=fake_get):
+        result = runner.invoke(get_python_versions, ['--docker', '--output', output])
+    assert result.exit_code == 0
+    if output == 'text':
+        assert result.output.startswith(
+            f"Cli script to show which are currently active python versions - v{__version__}"
+        )
+        assert '    3.12.4-slim' in result.output
+    elif output == 'json':
+        assert json.loads(result.output)[1]['docker_images'] == ['3.12.4', '3.12.4-slim']
+    elif output == 'ndjson':
+        assert [json.loads(_l)['version'] for _l in result.output.splitlines()] == ['3.13', '3.12', '3.10', '3.1']
+    else:
+        _lines = result.output.splitlines()
+        assert _lines[0] == 'version,latest_sw,start,end,docker_images'
+        assert _lines[2] == '3.12,3.12.4,2023-10-02,2028-10,3.12.4 3.12.4-slim'
+
+
+def test_cli_no_stdout(runner, fake_get):
+    """Test --no-stdout prints nothing and leaves stdout untouched.
+
+    Arguments:
+        runner: Click runner
+        fake_get: fake pages
+    """
+    _stdout = sys.stdout
+    with patch('python_active_versions.python_active_versions.CachedHTMLSession.get', side_effect=fake_get):
+        result = runner.invoke(get_python_versions, ['--no-stdout'])
+    assert result.exit_code == 0
+    assert result.output == ''
+    assert sys.stdout is _stdout
+
+
+def test_cli_tag_filter(runner, fake_get):
+    """Test --tag-filter options select docker images, invalid expressions are refused.
+
+    Arguments:
+        runner: Click runner
+        fake_get: fake pages
+    """
+    with patch('python_active_versions.python_active_versions.CachedHTMLSession.get', side_effect=fake_get):
+        result = runner.invoke(get_python_versions, ['-d', '-f', 'variant:slim', '-o', 'ndjson'])
+    assert result.exit_code == 0
+    assert [json.loads(_l)['docker_images'] for _l in result.output.splitlines()] == [
+        ['3.13-slim'],
+        ['3.12.4-slim'],
+        ['3.10.14-slim'],
+        ['3.1.4-slim'],
+    ]
+
+    result = runner.invoke(get_python_versions, ['-f', 'slim'])
+    assert result.exit_code == 2
+    assert "Invalid tag filter 'slim'" in result.output
+
+
+def test_single_flight_lookups(fake_get, tmp_path):
+    """Test concurrent single-flight lookups crawl once, the others read its result; plain lookups store nothing.
+
+    Arguments:
+        fake_get: fake pages
+        tmp_path: pytest temporary folder
+    """
+
+    def _slow_get(url, **kwargs):
+        time.sleep(0.05)
+        return fake_get(url, **kwargs)
+
+    _results = []
+
+    def _lookup():
+        _results.append(
+            get_active_python_versions(
+                docker_images=True,
+                cache_backend='filesystem',
+                cache_path=str(tmp_path / 'http_cache'),
+                single_flight=True,
+            )
+        )
+
+    with patch('python_active_versions.python_active_versions.result_cache', ResultCache(tmp_path)), patch(
+        'python_active_versions.python_active_versions.CachedHTMLSession.get', side_effect=_slow_get
+    ):
+        _threads = [threading.Thread(target=_lookup) for _ in range(3)]
+        for _thread in _threads:
+            _thread.start()
+        for _thread in _threads:
+            _thread.join()
+    assert len(_results) == 3 and _results[0] == _results[1] == _results[2]
+    assert fake_get.calls.count('https://devguide.python.org/versions/') == 1
+
+    _results_dir = tmp_path / 'results'
+    with patch('python_active_versions.python_active_versions.result_cache', ResultCache(_results_dir)), patch(
+        'python_active_versions.python_active_versions.CachedHTMLSession.get', side_effect=fake_get
+    ):
+        get_active_python_versions(docker_images=True)
+    assert not _results_dir.exists()
+
+
+def test_cli_single_flight(runner):
+    """Test single-flight is enabled by option or environment variable, not with --stream.
+
+    Arguments:
+        runner: Click runner
+    """
+    with patch('python_active_versions.python_active_versions.get_active_python_versions') as patched_get:
+        patched_get.return_value = []
+        assert runner.invoke(get_python_versions, ['-r']).exit_code == 0
+        assert patched_get.call_args.kwargs['single_flight'] is False
+        result = runner.invoke(get_python_versions, ['-r'], env={'PYTHON_ACTIVE_VERSIONS_SINGLE_FLIGHT': '1'})
+        assert result.exit_code == 0
+        assert patched_get.call_args.kwargs['single_flight'] is True
+    assert runner.invoke(get_python_versions, ['--stream', '--single-flight']).exit_code == 2
+
+
+def test_library_without_side_effects(fake_get, tmp_path):
+    """Test lookups never configure logging, and use the given session, executor and result cache.
+
+    Arguments:
+        fake_get: fake pages
+        tmp_path: pytest temporary folder
+    """
+    _session = MagicMock()
+    _session.get.side_effect = fake_get
+    _cache = ResultCache(tmp_path)
+    _root = logging.getLogger()
+    _handlers, _level = list(_root.handlers), _root.level
+    with ThreadPoolExecutor(max_workers=2) as _executor:
+        for _ in range(3):
+            _versions = get_active_python_versions(
+                docker_images=True, session=_session, executor=_executor, cache=_cache, result_ttl=60
+            )
+        # executor is left running for the next calls
+        assert _executor.submit(lambda: 1).result() == 1
+    assert _versions[1]['docker_images'] == ['3.12.4', '3.12.4-slim']
+    assert fake_get.calls.count('https://devguide.python.org/versions/') == 1
+    assert list(tmp_path.glob('*.json'))
+    assert (_root.handlers, _root.level) == (_handlers, _level)
+
+    with pytest.warns(DeprecationWarning, match='log_level'):
+        get_active_python_versions(log_level='DEBUG', session=_session)
+    assert (_root.handlers, _root.level) == (_handlers, _level)
+
+    # options added after the original ones are keyword-only, they can't be mixed up positionally
+    with pytest.raises(TypeError):
+        get_active_python_versions(False, None, True, 10)
@@ -0,0 +1,26 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Test releases module."""
+
+from python_active_versions.releases import ReleaseIndex, release_key
+
+
+def test_release_key():
+    """Test releases compare by version, not by text."""
+    assert release_key('3.12.10') > release_key('3.12.9')
+    assert release_key('3.13.0') > release_key('3.13.0rc2') > release_key('3.13.0b3') > release_key('3.13.0a1')
+    assert release_key('3.12') == release_key('3.12.0')
+    assert release_key('main') is None
+
+
+def test_release_index():
+    """Test latest release lookup by exact branch."""
+    _index = ReleaseIndex(['3.12.9', '3.1.4', '3.10.14', '3.12.10', '3.1.5', 'not-a-release'])
+    assert _index.latest('3.12') == '3.12.10'
+    assert _index.latest('3.1') == '3.1.5'
+    assert _index.latest('3.10') == '3.10.14'
+    assert _index.latest('3.13') is None
+    assert _index.latest('main') is None
+    assert _index.releases('3.12') == ['3.12.10', '3.12.9']
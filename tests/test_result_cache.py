@@ -0,0 +1,154 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Test result_cache module."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from python_active_versions.file_lock import FileLock, LockTimeoutError
+from python_active_versions.result_cache import ResultCache, cache_key
+
+
+def test_cache_key():
+    """Test cache key depends only on arguments values."""
+    assert cache_key(a=1, b=True) == cache_key(b=True, a=1)
+    assert cache_key(a=1, b=True) != cache_key(a=1, b=False)
+
+
+def test_fresh_result(tmp_path):
+    """Test fresh result is fetched once and then read back, also from another instance.
+
+    Arguments:
+        tmp_path: pytest temporary folder
+    """
+    _fetch = MagicMock(return_value=[{'version': '3.12'}])
+    _cache = ResultCache(tmp_path)
+    assert _cache.get('key', _fetch, ttl=60) == [{'version': '3.12'}]
+    assert _cache.get('key', _fetch, ttl=60) == [{'version': '3.12'}]
+    assert ResultCache(tmp_path).get('key', _fetch, ttl=60) == [{'version': '3.12'}]
+    _fetch.assert_called_once()
+
+
+def test_result_copies(tmp_path):
+    """Test changing a returned result doesn't change the cached one.
+
+    Arguments:
+        tmp_path: pytest temporary folder
+    """
+    _cache = ResultCache(tmp_path)
+    _fetched = _cache.get('key', lambda: [{'version': '3.12', 'docker_images': ['3.12.4']}], ttl=60)
+    _fetched[0]['docker_images'].append('changed')
+    _cached = _cache.get('key', MagicMock(), ttl=60)
+    assert _cached == [{'version': '3.12', 'docker_images': ['3.12.4']}]
+    _cached.clear()
+    assert _cache.get('key', MagicMock(), offline=True) == [{'version': '3.12', 'docker_images': ['3.12.4']}]
+
+
+def test_stale_while_revalidate(tmp_path):
+    """Test stale result is served at once and refreshed in background.
+
+    Arguments:
+        tmp_path: pytest temporary folder
+    """
+    _cache = ResultCache(tmp_path)
+    with patch('python_active_versions.result_cache.time.time', return_value=time.time() - 120):
+        _cache.store('key', [{'version': '3.11'}])
+
+    _fetch = MagicMock(return_value=[{'version': '3.12'}])
+    assert _cache.get('key', _fetch, ttl=60) == [{'version': '3.11'}]
+    for _thread in [_t for _t in threading.enumerate() if _t.name.startswith('refresh-')]:
+        _thread.join()
+    _fetch.assert_called_once()
+    assert _cache.get('key', _fetch, ttl=60) == [{'version': '3.12'}]
+
+
+def test_refresh_and_offline(tmp_path):
+    """Test refresh always fetches and offline never does.
+
+    Arguments:
+        tmp_path: pytest temporary folder
+    """
+    _fetch = MagicMock(return_value=[{'version': '3.12'}])
+    _cache = ResultCache(tmp_path)
+    with pytest.raises(LookupError):
+        _cache.get('key', _fetch, offline=True)
+    _cache.get('key', _fetch, refresh=True)
+    _cache.get('key', _fetch, refresh=True)
+    assert _fetch.call_count == 2
+    assert _cache.get('key', _fetch, ttl=0, offline=True) == [{'version': '3.12'}]
+    assert _fetch.call_count == 2
+
+
+def test_single_flight(tmp_path):
+    """Test concurrent lookups of a missing result fetch it once, the others read the stored one.
+
+    Arguments:
+        tmp_path: pytest temporary folder
+    """
+    _started = threading.Event()
+
+    def _fetch():
+        _started.set()
+        time.sleep(0.2)
+        return [{'version': '3.12'}]
+
+    _fetch_mock = MagicMock(side_effect=_fetch)
+    _results = []
+    # separate instances share only the folder, as separate processes do
+    _threads = [
+        threading.Thread(target=lambda: _results.append(ResultCache(tmp_path).get('key', _fetch_mock, ttl=60)))
+        for _ in range(4)
+    ]
+    for _thread in _threads:
+        _thread.start()
+    for _thread in _threads:
+        _thread.join()
+    assert _results == [[{'version': '3.12'}]] * 4
+    _fetch_mock.assert_called_once()
+
+    # refresh waiting for another refresh reads its result
+    _lock = FileLock(tmp_path / 'key.lock')
+    _lock.acquire()
+    _waiting = threading.Thread(
+        target=lambda: _results.append(ResultCache(tmp_path).get('key', _fetch_mock, refresh=True))
+    )
+    _waiting.start()
+    time.sleep(0.1)
+    ResultCache(tmp_path).store('key', [{'version': '3.13'}])
+    _lock.release()
+    _waiting.join()
+    assert _results[-1] == [{'version': '3.13'}]
+    _fetch_mock.assert_called_once()
+
+
+def test_lock_timeout(tmp_path):
+    """Test a lock held for too long doesn't block the lookup.
+
+    Arguments:
+        tmp_path: pytest temporary folder
+    """
+    _fetch = MagicMock(return_value=[{'version': '3.12'}])
+    with FileLock(tmp_path / 'key.lock'):
+        with pytest.raises(LockTimeoutError):
+            FileLock(tmp_path / 'key.lock', timeout=0.1).acquire()
+        assert ResultCache(tmp_path, lock_timeout=0.1).get('key', _fetch) == [{'version': '3.12'}]
+    _fetch.assert_called_once()
+
+
+def test_unwritable_folder(tmp_path):
+    """Test results are fetched and kept in memory when the folder can't be written.
+
+    Arguments:
+        tmp_path: pytest temporary folder
+    """
+    (tmp_path / 'file').touch()
+    _fetch = MagicMock(return_value=[{'version': '3.12'}])
+    _cache = ResultCache(tmp_path / 'file' / 'results')
+    assert _cache.fetch_once('key', _fetch, 0) == [{'version': '3.12'}]
+    assert _cache.get('key', _fetch, ttl=60) == [{'version': '3.12'}]
+    _fetch.assert_called_once()
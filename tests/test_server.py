@@ -0,0 +1,135 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Tests for the warm result HTTP server."""
+
+import http.client
+import json
+import socket
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from python_active_versions.cli_tools.cli import get_python_versions
+from python_active_versions.server import WarmResult, create_server
+
+_VERSIONS = [{'version': '3.13', 'latest_sw': '3.13'}, {'version': '3.12', 'latest_sw': '3.12.4'}]
+
+
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path: str):
+        super().__init__('localhost')
+        self._path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self._path)
+
+
+def _get(connection, path, **kwargs):
+    connection.request('GET', path, **kwargs)
+    _response = connection.getresponse()
+    return _response, _response.read()
+
+
+def _serving(result, **kwargs):
+    _server = create_server(result, port=0, **kwargs)
+    threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server
+
+
+def test_warm_result_served():
+    """Test served paths, not ready state and conditional requests."""
+    _fetch = MagicMock(return_value=_VERSIONS)
+    _result = WarmResult(_fetch)
+    _server = _serving(_result)
+    try:
+        _connection = http.client.HTTPConnection(*_server.server_address)
+        assert _get(_connection, '/versions')[0].status == 503
+
+        _result.refresh()
+        _response, _body = _get(_connection, '/versions')
+        assert _response.status == 200
+        assert json.loads(_body) == _VERSIONS
+
+        _response, _body = _get(_connection, '/versions/3.12')
+        assert json.loads(_body)['latest_sw'] == '3.12.4'
+        _response, _ = _get(_connection, '/versions/3.12', headers={'If-None-Match': _response.getheader('ETag')})
+        assert _response.status == 304
+
+        assert _get(_connection, '/versions/2.7')[0].status == 404
+    finally:
+        _server.shutdown()
+        _server.server_close()
+    _fetch.assert_called_once()
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="unix sockets not available")
+def test_warm_result_unix_socket(tmp_path):
+    """Test result served over a unix socket.
+
+    Arguments:
+        tmp_path: pytest temporary folder
+    """
+    _result = WarmResult(lambda: _VERSIONS)
+    _result.refresh()
+    _path = str(tmp_path / 'pav.sock')
+    for _ in range(2):
+        # socket left by the first server is replaced
+        _server = _serving(_result, unix_socket=_path)
+        try:
+            assert json.loads(_get(_UnixConnection(_path), '/versions/3.13')[1]) == _VERSIONS[0]
+        finally:
+            _server.shutdown()
+            _server.server_close()
+
+    _file = tmp_path / 'versions.json'
+    _file.write_text('keep me')
+    with pytest.raises(ValueError, match='not a unix socket'):
+        create_server(_result, unix_socket=str(_file))
+    assert _file.read_text() == 'keep me'
+
+
+def test_refresh_keeps_previous_result():
+    """Test a failed background refresh keeps serving the previous result."""
+    _fetch = MagicMock(side_effect=[_VERSIONS, ConnectionError('down'), _VERSIONS[:1]])
+    _result = WarmResult(_fetch)
+    _result.refresh()
+    _stop = threading.Event()
+    _thread = _result.refresh_periodically(0.01, _stop)
+    while _fetch.call_count < 3:
+        _thread.join(0.01)
+    _stop.set()
+    _thread.join()
+    assert json.loads(_result.get('/versions')[0]) == _VERSIONS[:1]
+
+
+def test_cli_serve(runner):
+    """Test serve subcommand fetches with main command options.
+
+    Arguments:
+        runner: Click runner
+    """
+    with patch('python_active_versions.server.serve') as patched_serve, patch(
+        'python_active_versions.python_active_versions.get_active_python_versions'
+    ) as patched_get:
+        result = runner.invoke(get_python_versions, ['--docker', '-w', '2', 'serve', '--port', '0'])
+        assert result.exit_code == 0
+        _fetch, _host, _port, _socket, _interval = patched_serve.call_args.args
+        assert (_host, _port, _socket, _interval) == ('127.0.0.1', 0, None, 300)
+        _fetch()
+        assert patched_get.call_args.kwargs['docker_images'] is True
+        assert patched_get.call_args.kwargs['max_workers'] == 2
+
+    result = runner.invoke(get_python_versions, ['--stream', 'serve'])
+    assert result.exit_code == 2
+
+    with patch(
+        'python_active_versions.python_active_versions.get_active_python_versions',
+        side_effect=LookupError('No cached result available in offline mode'),
+    ):
+        result = runner.invoke(get_python_versions, ['--offline', 'serve', '--port', '0'])
+    assert result.exit_code == 1
+    assert 'Error: No cached result available in offline mode' in result.output
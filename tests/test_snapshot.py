@@ -0,0 +1,77 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Tests for snapshot files."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from python_active_versions.cli_tools.cli import get_python_versions
+from python_active_versions.snapshot import export_snapshot, load_snapshot, select_versions
+
+_VERSIONS = [
+    {'version': 'main', 'latest_sw': 'main', 'start': '2025-10-01', 'end': '2030-10', 'docker_images': []},
+    {'version': '3.12', 'latest_sw': '3.12.4', 'start': '2023-10-02', 'end': '2028-10', 'docker_images': ['3.12.4']},
+]
+
+
+@pytest.mark.parametrize('name', ['snapshot.json', 'snapshot.json.gz'])
+def test_export_load(tmp_path, name):
+    """Test snapshot round trip, compressed or not.
+
+    Arguments:
+        tmp_path: pytest temporary folder
+        name: snapshot file name
+    """
+    export_snapshot(_VERSIONS, tmp_path / name)
+    _created, _versions = load_snapshot(tmp_path / name)
+    assert _versions == _VERSIONS
+    assert _created > 0
+    assert (tmp_path / name).read_bytes().startswith(b'{"format":1,' if name.endswith('.json') else b'\x1f\x8b')
+
+
+def test_load_unsupported(tmp_path):
+    """Test files not written by export are refused.
+
+    Arguments:
+        tmp_path: pytest temporary folder
+    """
+    (tmp_path / 'other.json').write_text(json.dumps({'format': 99, 'versions': []}))
+    with pytest.raises(ValueError, match='Unsupported snapshot format 99'):
+        load_snapshot(tmp_path / 'other.json')
+    (tmp_path / 'other.json').write_text('[]')
+    with pytest.raises(ValueError, match='not a snapshot file'):
+        load_snapshot(tmp_path / 'other.json')
+
+
+def test_select_versions():
+    """Test snapshot versions are filtered as the requested fetch."""
+    assert select_versions(_VERSIONS, docker_images=False, no_main=True) == [
+        {'version': '3.12', 'latest_sw': '3.12.4', 'start': '2023-10-02', 'end': '2028-10'}
+    ]
+    assert select_versions(_VERSIONS, docker_images=True, no_main=False) == _VERSIONS
+    with pytest.raises(LookupError):
+        select_versions([{'version': '3.12'}], docker_images=True, no_main=True)
+
+
+def test_cli_export_snapshot(runner, fake_get, tmp_path):
+    """Test exported snapshot is read back without any request.
+
+    Arguments:
+        runner: Click runner
+        fake_get: fake pages
+        tmp_path: pytest temporary folder
+    """
+    _path = str(tmp_path / 'snapshot.json.gz')
+    with patch('python_active_versions.python_active_versions.CachedHTMLSession.get', side_effect=fake_get):
+        result = runner.invoke(get_python_versions, ['--docker', 'export', _path])
+    assert result.exit_code == 0
+
+    with patch('python_active_versions.python_active_versions.CachedHTMLSession.get') as patched_get:
+        result = runner.invoke(get_python_versions, ['--snapshot', _path, '--docker', '--output', 'json'])
+        patched_get.assert_not_called()
+    assert result.exit_code == 0
+    assert json.loads(result.output)[1]['docker_images'] == ['3.12.4', '3.12.4-slim']
@@ -0,0 +1,133 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Tests for docker tags filter."""
+
+from unittest.mock import MagicMock
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from python_active_versions.python_active_versions import _fetch_tags, fetch_docker_tags
+from python_active_versions.tag_filter import TagFilter, starts_with
+
+
+def _result(name, *architectures):
+    return {
+        'name': name,
+        'images': [{'architecture': _a.split('/')[0], 'variant': _a[6:] or None} for _a in architectures],
+    }
+
+
+def _sorted_pages(names, page_size=2):
+    """Fake session listing given tag names by name, ``page_size`` per page.
+
+    Arguments:
+        names: tag names of the repository
+        page_size: tags per page
+
+    Returns:
+        session whose get calls are recorded
+    """
+    _session = MagicMock()
+
+    def _get(url, **_kwargs):
+        _query = parse_qs(urlsplit(url).query)
+        _page = int(_query.get('page', ['1'])[0])
+        _names = sorted(_n for _n in names if _query['name'][0] in _n)
+        _response = MagicMock()
+        _response.json.return_value = {
+            'count': len(_names),
+            'next': f"{url.split('&page=')[0]}&page={_page + 1}" if _page * page_size < len(_names) else None,
+            'results': [{'name': _n} for _n in _names[(_page - 1) * page_size : _page * page_size]],
+        }
+        return _response
+
+    _session.get.side_effect = _get
+    return _session
+
+
+def test_starts_with_version_boundary():
+    """Test versions ending with a digit don't match longer version numbers."""
+    assert starts_with('3.1.4-slim', '3.1')
+    assert starts_with('3.1-slim', '3.1')
+    assert not starts_with('3.10.14', '3.1')
+    assert starts_with('3.12.4b1', '3.12.4')
+    assert starts_with('3.12.4-slim', '3.12.4-')
+    assert not starts_with('3.12', '3.12.4')
+
+
+def test_parse():
+    """Test filter expressions."""
+    assert TagFilter.parse(['variant:slim', 'arch:arm64/v8', 'variant:bookworm', 'regex:^3']) == TagFilter(
+        regex='^3', variants=('slim', 'bookworm'), arch='arm64/v8'
+    )
+    for _expressions in (['slim'], ['size:10'], ['prefix:'], ['arch:amd64', 'arch:arm64'], ['regex:(']):
+        with pytest.raises(ValueError):
+            TagFilter.parse(_expressions)
+
+
+def test_matches():
+    """Test every criterion must match."""
+    _filter = TagFilter(variants=('slim', 'bookworm'), arch='arm64/v8')
+    assert _filter.matches('3.12.4', _result('3.12.4-slim-bookworm', 'amd64', 'arm64/v8'))
+    assert not _filter.matches('3.12.4', _result('3.12.4-slim-bookworm', 'amd64'))
+    assert not _filter.matches('3.12.4', _result('3.12.4-slim', 'arm64/v8'))
+    assert TagFilter(variants=('alpine',)).match_name('3.12.4', '3.12.4b1-alpine3.20')
+    assert not TagFilter(variants=('slim',)).match_name('3.12.4', '3.12.4-slimmer')
+    assert TagFilter(regex='windows').match_name('3.12.4', '3.12.4-windowsservercore-ltsc2022')
+    assert not TagFilter().match_name('3.1', '3.10-slim')
+
+
+def test_name_filter():
+    """Test prefix narrows docker hub name filter, or excludes versions it doesn't cover."""
+    assert TagFilter().name_filter('3.12.4') == '3.12.4'
+    assert TagFilter(prefix='3.12').name_filter('3.12.4') == '3.12.4'
+    assert TagFilter(prefix='3.12.4-slim').name_filter('3.12.4') == '3.12.4-slim'
+    assert TagFilter(prefix='3.1').name_filter('3.10.14') is None
+    assert TagFilter(prefix='3.12.4-slim').is_past('3.12.4', '3.12.4-windowsservercore')
+    assert not TagFilter(prefix='3.12.4-slim').is_past('3.12.4', '3.12.4-slim-bullseye')
+
+
+def test_fetch_tags_prefix_stops_paging():
+    """Test tags listed by name stop being fetched once past the prefix."""
+    # docker hub name filter matches substrings, tags holding the prefix elsewhere are listed after the matching ones
+    _names = ['3.12.4-slim', '3.12.4-slim-bookworm', '3.12.4-slim-bullseye', 'ci-3.12.4-slim', 'dev-3.12.4-slim']
+    _session = _sorted_pages(_names + [f"nightly-{_i}-3.12.4-slim" for _i in range(10)] + ['3.12.4', '3.12.40'])
+    assert _fetch_tags('python', '3.12.4', 2, session=_session, tag_filter=TagFilter(prefix='3.12.4-slim')) == [
+        '3.12.4-slim',
+        '3.12.4-slim-bookworm',
+        '3.12.4-slim-bullseye',
+    ]
+    _urls = [_c.args[0] for _c in _session.get.call_args_list]
+    assert 'name=3.12.4-slim&' in _urls[0] and 'ordering=name' in _urls[0]
+    # second page ends with ci-3.12.4-slim, past the prefix: the other six pages aren't fetched
+    assert len(_urls) == 2
+
+    _session = _sorted_pages(_names + ['3.12.40', '3.12.4'])
+    assert _fetch_tags('python', '3.1', 2, session=_session, tag_filter=TagFilter(prefix='3.12.4')) == []
+    _session.get.assert_not_called()
+
+
+def test_fetch_tags_filtered_pages():
+    """Test pages are filtered on version boundary while fetched."""
+    _session = _sorted_pages(['3.1', '3.1-slim', '3.1.4', '3.10', '3.10-slim', '3.11.9', '3.1.4-slim'], page_size=3)
+    assert _fetch_tags('python', '3.1', 3, session=_session, tag_filter=TagFilter()) == [
+        '3.1',
+        '3.1-slim',
+        '3.1.4',
+        '3.1.4-slim',
+    ]
+    assert _fetch_tags('python', '3.1', 3, session=_session, tag_filter=TagFilter(variants=('slim',))) == [
+        '3.1-slim',
+        '3.1.4-slim',
+    ]
+
+
+def test_fetch_docker_tags_prefix():
+    """Test batch fetch pushes the prefix to docker hub and skips versions it excludes."""
+    _session = _sorted_pages(['3.10.14', '3.10.14-slim', '3.12.4', '3.12.4-slim', '3.12.40-slim'])
+    _tags = fetch_docker_tags(['python'], ['3.12.4', '3.10.14'], 2, session=_session, tag_filter=TagFilter('3.12.4-'))
+    assert _tags == {'python': {'3.12.4': ['3.12.4-slim'], '3.10.14': []}}
+    assert len(_session.get.call_args_list) == 1
@@ -0,0 +1,174 @@
+# SPDX-FileCopyrightText: 2024 Gabriele Pongelli
+#
+# SPDX-License-Identifier: MIT
+
+"""Tests for retries, rate limits, per-host concurrency and circuit breaker, against the recorded responses server."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+from requests import HTTPError, Timeout
+
+from python_active_versions.metrics import StatsCollector, metrics
+from python_active_versions.python_active_versions import (
+    ActiveVersionsError,
+    _get_page,
+    _tags_url,
+    build_session,
+    get_active_python_versions,
+)
+from python_active_versions.transport import CircuitOpenError, RetryPolicy, Transport, _retry_after
+
+
+def _resilient_session(**kwargs):
+    _sleeps = []
+    _session = build_session(cache_backend='memory', transport=Transport(sleep=_sleeps.append, **kwargs))
+    return _session, _sleeps
+
+
+def _first_tags(session, page_size=100, deadline=None):
+    # a single page, distinct page sizes are distinct urls for the http cache
+    return [_r['name'] for _r in _get_page(session, _tags_url('python', '3.12.4', page_size), deadline)['results']]
+
+
+def test_retry_after(registry):
+    """Test 429 is retried after the time asked by the registry, retries are reported.
+
+    Arguments:
+        registry: recorded responses server, scripted
+    """
+    registry.script = [(429, {'Retry-After': '7'}), (503, {})]
+    _session, _sleeps = _resilient_session()
+    _collector = StatsCollector()
+    metrics.add_hook(_collector)
+    try:
+        assert _first_tags(_session)[0] == '3.12.4'
+    finally:
+        metrics.remove_hook(_collector)
+    assert len(registry.requests) == 3
+    assert _sleeps[0] == 7
+    # jittered exponential backoff, second retry
+    assert 0 <= _sleeps[1] <= 1
+    assert [_e.retries for _e in _collector.http] == [2]
+
+
+def test_failed_status_raised(registry):
+    """Test a page still failing after retries raises instead of returning partial results.
+
+    Arguments:
+        registry: recorded responses server, scripted
+    """
+    registry.script = [(503, {})] * 3
+    _session, _sleeps = _resilient_session(policy=RetryPolicy(attempts=3))
+    with pytest.raises(HTTPError):
+        _first_tags(_session)
+    assert len(_sleeps) == 2
+
+
+def test_circuit_breaker(registry):
+    """Test a host failing too many times is not contacted until its cooldown expires.
+
+    Arguments:
+        registry: recorded responses server, scripted
+    """
+    registry.script = [(502, {})] * 2
+    _session, _ = _resilient_session(policy=RetryPolicy(attempts=1), failure_threshold=2, cooldown=60)
+    for _ in range(2):
+        with pytest.raises(HTTPError):
+            _first_tags(_session)
+    with pytest.raises(CircuitOpenError):
+        _first_tags(_session)
+    assert len(registry.requests) == 2
+
+
+def test_rate_limit_remaining(registry):
+    """Test requests wait the rate limit reset once the last allowed request is used.
+
+    Arguments:
+        registry: recorded responses server, scripted
+    """
+    registry.script = [
+        (200, {'ratelimit-remaining': '0;w=21600', 'ratelimit-reset': str(int(time.time()) + 5)}),
+        (200, {'ratelimit-remaining': '0;w=21600'}),
+    ]
+    _session, _sleeps = _resilient_session()
+    _first_tags(_session)
+    _first_tags(_session, 10)
+    assert 3 < _sleeps[0] <= 5
+    # window of six hours is longer than allowed wait
+    with pytest.raises(CircuitOpenError, match='Rate limit'):
+        _first_tags(_session, 20)
+    assert len(registry.requests) == 2
+
+
+def test_deadline_stops_retries(registry):
+    """Test waits ending after the overall deadline are never started, the last failure is returned at once.
+
+    Arguments:
+        registry: recorded responses server, scripted
+    """
+    registry.script = [(429, {'Retry-After': '3'})] * 4
+    _session = build_session(cache_backend='memory', transport=Transport())
+    _start = time.monotonic()
+    with pytest.raises(HTTPError):
+        _first_tags(_session, deadline=_start + 0.5)
+    assert time.monotonic() - _start < 0.5
+    assert len(registry.requests) == 1
+
+    # rate limit resetting after the deadline
+    registry.script = [(200, {'ratelimit-remaining': '0', 'ratelimit-reset': '5'})]
+    _session, _sleeps = _resilient_session()
+    _first_tags(_session)
+    with pytest.raises(Timeout, match='overall deadline'):
+        _first_tags(_session, 10, time.monotonic() + 0.5)
+    assert _sleeps == [] and len(registry.requests) == 2
+
+
+def test_timeout_covers_retries(registry):
+    """Test lookups give up retrying by the overall timeout, so no worker outlives it.
+
+    Arguments:
+        registry: recorded responses server, scripted
+    """
+    registry.script = [(429, {'Retry-After': '3'})] * 20
+    _session = build_session(cache_backend='memory', transport=Transport())
+    _start = time.monotonic()
+    with pytest.raises(ActiveVersionsError):
+        get_active_python_versions(docker_images=True, timeout=0.5, session=_session)
+    # workers, joined at interpreter exit, are over as well
+    _workers = [_t for _t in threading.enumerate() if _t.name.startswith('ThreadPoolExecutor')]
+    for _worker in _workers:
+        _worker.join(1)
+    assert time.monotonic() - _start < 1.5
+
+
+def test_host_concurrency():
+    """Test requests in flight toward the same host are capped."""
+    _transport = Transport(host_concurrency=2)
+    _in_flight = [0]
+    _peak = [0]
+    _lock = threading.Lock()
+
+    def _call():
+        with _lock:
+            _in_flight[0] += 1
+            _peak[0] = max(_peak[0], _in_flight[0])
+        time.sleep(0.02)
+        with _lock:
+            _in_flight[0] -= 1
+        return MagicMock(status_code=200, headers={})
+
+    with ThreadPoolExecutor(max_workers=6) as _executor:
+        list(_executor.map(lambda _: _transport.send('registry.hub.docker.com', _call), range(6)))
+    assert _peak[0] == 2
+
+
+def test_retry_after_http_date():
+    """Test Retry-After given as HTTP date."""
+    _response = MagicMock(headers={'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'})
+    assert _retry_after(_response) == 0
+    _response.headers = {'Retry-After': 'soon'}
+    assert _retry_after(_response) is None
@@ -7,7 +7,9 @@
 import logging
 from unittest.mock import patch
 
-from python_active_versions.utility import configure_logger
+import pytest
+
+from python_active_versions.utility import configure_logger, write_atomically
 
 
 @patch('logging.basicConfig')
@@ -45,3 +47,20 @@ def test_logger(patched_log):
         format='%(asctime)s [%(levelname)s - %(filename)s:%(lineno)d]    %(message)s',
         handlers=None,
     )
+
+
+def test_write_atomically(tmp_path):
+    """Test file is replaced as a whole and no temporary file is left behind, also on failure.
+
+    Arguments:
+        tmp_path: pytest temporary folder
+    """
+    _file = tmp_path / 'folder' / 'data.json'
+    write_atomically(_file, b'old')
+    write_atomically(_file, b'new')
+    assert _file.read_bytes() == b'new'
+
+    with patch('os.replace', side_effect=OSError('disk full')), pytest.raises(OSError, match='disk full'):
+        write_atomically(_file, b'lost')
+    assert _file.read_bytes() == b'new'
+    assert list(_file.parent.iterdir()) == [_file]